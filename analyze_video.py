@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Offline emotion analysis for recorded study sessions
+Samples frames from a video file, detects emotions in parallel across
+CPU cores and writes the results to the emotion timeline in one go.
+
+Usage:
+    python analyze_video.py session.mp4 --fps 1 --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+import cv2
+
+# Detector owned by this worker process
+_detector = None
+
+
+def load_detector(name):
+    """Build the emotion detector selected on the command line"""
+    from detector_backends import create_detector
+    return create_detector(name)
+
+
+def _init_worker(detector_name):
+    """Pool initializer: build the detector once per worker process"""
+    global _detector
+    # Parallelism comes from processes; keep OpenCV from oversubscribing cores
+    cv2.setNumThreads(1)
+    _detector = load_detector(detector_name)
+
+
+def analyze_segment(video_path, start_frame, end_frame, step):
+    """
+    Detect emotions on every step-th frame in [start_frame, end_frame)
+    end_frame may be None to read until the end of the video
+    Returns: list of (frame_index, emotion, confidence)
+    """
+    cap = cv2.VideoCapture(video_path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+    results = []
+    index = start_frame
+    try:
+        while end_frame is None or index < end_frame:
+            if index % step:
+                # Skipped frames are only grabbed, never fully decoded into BGR
+                if not cap.grab():
+                    break
+            else:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                emotion, confidence = _detector.detect_emotion(frame)
+                results.append((index, emotion, confidence))
+            index += 1
+    finally:
+        cap.release()
+
+    return results
+
+
+def plan_segments(frame_count, step, segments):
+    """Split the video into contiguous ranges aligned to the sampling step"""
+    if frame_count <= 0:
+        # Unknown length: one sequential pass
+        return [(0, None)]
+
+    samples = (frame_count + step - 1) // step
+    per_segment = max(1, (samples + segments - 1) // segments) * step
+    return [(start, min(start + per_segment, frame_count))
+            for start in range(0, frame_count, per_segment)]
+
+
+def analyze_video(video_path, sample_fps=1.0, workers=None, detector_name='simple'):
+    """
+    Analyse a video file in parallel
+    Returns: (results sorted by frame index, video fps, elapsed seconds)
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video: {video_path}")
+
+    video_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    step = max(1, round(video_fps / sample_fps))
+    workers = workers or os.cpu_count() or 1
+    # A few segments per worker keeps cores busy when segments run unevenly
+    segments = plan_segments(frame_count, step, workers * 4)
+
+    print(f"📹 {video_path}: {frame_count} frames at {video_fps:.1f} fps, "
+          f"sampling every {step} frames with {workers} workers")
+
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(detector_name,)) as pool:
+        futures = [pool.submit(analyze_segment, video_path, start, end, step)
+                   for start, end in segments]
+        for future in futures:
+            results.extend(future.result())
+    elapsed = time.perf_counter() - started
+
+    results.sort(key=lambda r: r[0])
+    return results, video_fps, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse emotions in a recorded study session")
+    parser.add_argument('video', help="Path to the video file")
+    parser.add_argument('--fps', type=float, default=1.0, help="Frames to analyse per second of video (default: 1)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--detector', choices=['simple', 'advanced', 'dnn', 'cascade'], default='simple',
+                        help="Detector backend, see backend/detector_backends.py (default: simple)")
+    parser.add_argument('--start', default=None,
+                        help="Recording start time (ISO format); defaults to file time minus video length")
+    parser.add_argument('--data-file', default=str(BACKEND_DIR / 'emotion_data.json'),
+                        help="Timeline file to append to")
+    parser.add_argument('--dry-run', action='store_true', help="Analyse without writing the timeline")
+    args = parser.parse_args()
+    if args.fps <= 0:
+        parser.error("--fps must be greater than 0")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if not Path(args.video).exists():
+        print(f"❌ Video not found: {args.video}")
+        sys.exit(1)
+
+    results, video_fps, elapsed = analyze_video(args.video, args.fps, args.workers, args.detector)
+
+    if not results:
+        print("❌ No frames could be analysed")
+        sys.exit(1)
+
+    duration = (results[-1][0] + 1) / video_fps
+    if args.start:
+        start = datetime.fromisoformat(args.start)
+    else:
+        start = datetime.fromtimestamp(os.path.getmtime(args.video)) - timedelta(seconds=duration)
+
+    print(f"⚡ Analysed {len(results)} frames in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.1f} frames/s, {duration / elapsed:.1f}x real time)")
+
+    if args.dry_run:
+        return
+
+    from data_logger import DataLogger
+
+    video_name = Path(args.video).name
+    entries = [{
+        'emotion': emotion,
+        'confidence': confidence,
+        'timestamp': start + timedelta(seconds=index / video_fps),
+        'additional_data': {'source': 'video', 'video': video_name, 'frame': index}
+    } for index, emotion, confidence in results]
+
+    DataLogger(args.data_file).log_emotions(entries)
+
+
+if __name__ == "__main__":
+    main()
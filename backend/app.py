@@ -1,22 +1,29 @@
+from startup_timing import mark, print_startup_report, startup_report
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
-import cv2
-import numpy as np
+from werkzeug.serving import is_running_from_reloader
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
-import json
 import os
-import base64
+import time
 
 # Load environment variables from .env file
 from dotenv import load_dotenv
 load_dotenv()
 
-from simple_emotion_detector import EmotionDetector
+from detector_backends import create_detector
 from music_recommender import MusicRecommender
 from subject_suggester import SubjectSuggester
 from data_logger import DataLogger
 from youtube_integration import youtube_client
+from frame_gate import FrameSimilarityGate
+from face_tracker import FaceTracker
+from detection_pool import DetectionPool
+from frame_mailbox import LatestFrameMailbox
+from emotion_smoother import EmotionSmoother
+from capture_pacer import CapturePacer
+mark('import app modules')
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend communication
@@ -25,10 +32,55 @@ CORS(app)  # Enable CORS for frontend communication
 socketio = SocketIO(app, cors_allowed_origins="*")
 
 # Initialize components
-emotion_detector = EmotionDetector()
+# Frames are decoded and analysed in worker processes (DETECTION_WORKERS)
+# by the detector backend chosen with EMOTION_DETECTOR
+detection_pool = DetectionPool(create_detector)
 music_recommender = MusicRecommender()
 subject_suggester = SubjectSuggester()
 data_logger = DataLogger()
+frame_gate = FrameSimilarityGate()
+frame_mailbox = LatestFrameMailbox()
+emotion_smoother = EmotionSmoother()
+capture_pacer = CapturePacer()
+mark('initialize components')
+
+# Upper bound on frames accepted by /detect-emotion/batch
+MAX_BATCH_FRAMES = int(os.getenv('MAX_BATCH_FRAMES', 32))
+
+# Seconds an HTTP request waits for a detection slot and result
+DETECTION_TIMEOUT = float(os.getenv('DETECTION_TIMEOUT', 10))
+
+# Per-session face tracking for real-time analysis
+FACE_TRACKING = os.getenv('FACE_TRACKING', 'true').lower() == 'true'
+face_trackers = {}
+# Connected Socket.IO sessions; results for frames still in flight when a
+# client disconnects are dropped instead of re-creating its session state
+active_sessions = set()
+
+# Tracking counters of disconnected sessions, for /detector/stats
+retired_tracking = {'tracked_frames': 0, 'full_detections': 0}
+
+# Per-session smoothing of real-time emotions; music and subject lookups
+# are only repeated when the (stable) emotion changes
+EMOTION_SMOOTHING = os.getenv('EMOTION_SMOOTHING', 'true').lower() == 'true'
+session_recommendations = {}
+
+# Warm and keep refreshing YouTube recommendations in the background, so
+# emotion results never wait on the YouTube API
+YOUTUBE_PREFETCH = os.getenv('YOUTUBE_PREFETCH', 'true').lower() == 'true'
+
+
+def start_background_tasks(use_reloader=False):
+    """
+    Start the YouTube refresher in the serving process
+    Called from the entry points rather than at import time: detection
+    workers re-import this module, and the debug reloader's watcher
+    process never serves requests.
+    """
+    if use_reloader and not is_running_from_reloader():
+        return
+    if YOUTUBE_PREFETCH:
+        youtube_client.start_refresher()
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -40,36 +92,56 @@ def detect_emotion():
     """
     Main endpoint for emotion detection and recommendations
     Accepts either:
-    1. Base64 encoded image from camera
-    2. Pre-detected emotion label
+    1. Raw JPEG/PNG bytes (application/octet-stream or image/* body)
+    2. Base64 encoded image from camera
+    3. Pre-detected emotion label
+    Add ?faces=all (or "all_faces": true) to get results for every face
+    The response's next_capture_ms is the recommended delay before the
+    next frame, paced per client ("session_id" field, X-Session-Id header
+    or client address)
     """
     try:
-        data = request.get_json()
+        if request.mimetype == 'application/octet-stream' or request.mimetype.startswith('image/'):
+            # Binary upload: hand the body straight to the decoder
+            data = {'image': request.get_data(cache=False)}
+        else:
+            data = request.get_json()
         
         if not data:
             return jsonify({"error": "No data provided"}), 400
         
         emotion = None
         confidence = 0.0
+        face = None
+        faces = None
         
         # Method 1: Process camera frame
         if 'image' in data:
-            # Decode base64 image
-            image_data = data['image'].split(',')[1]  # Remove data:image/jpeg;base64,
-            image_bytes = base64.b64decode(image_data)
+            # Decode and detect in the worker pool
+            all_faces = wants_all_faces(data)
+            # One deadline covers waiting for a slot and for the result
+            deadline = time.monotonic() + DETECTION_TIMEOUT
+            future = detection_pool.submit(data['image'], all_faces=all_faces,
+                                           block=True, timeout=DETECTION_TIMEOUT)
+            if future is None:
+                return jsonify({"error": "Server busy, try again"}), 503
             
-            # Convert to OpenCV format
-            nparr = np.frombuffer(image_bytes, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            try:
+                outcome = future.result(timeout=max(deadline - time.monotonic(), 0))
+            except FutureTimeoutError:
+                return jsonify({"error": "Detection timed out, try again"}), 504
+            if 'error' in outcome:
+                return jsonify({"error": outcome['error']}), 400
             
-            # Detect emotion from frame
-            emotion, confidence = emotion_detector.detect_emotion(frame)
+            emotion, confidence, face = outcome['emotion'], outcome['confidence'], outcome['face']
+            faces = outcome.get('faces')
         
         # Method 2: Use pre-detected emotion
         elif 'emotion' in data:
             emotion = data['emotion'].lower()
             confidence = data.get('confidence', 1.0)
         
+        else:
             return jsonify({"error": "Either 'image' or 'emotion' must be provided"}), 400
         
         if not emotion:
@@ -92,14 +164,23 @@ def detect_emotion():
         # Log the emotion data for timeline
         data_logger.log_emotion(emotion, confidence)
         
+        # Back off while this client's emotion is stable
+        client_id = data.get('session_id') or request.headers.get('X-Session-Id') or request.remote_addr
+        face_found = face is not None or 'image' not in data
+        next_capture_ms = capture_pacer.next_delay(f"http:{client_id}", emotion, face_found)
+        
         # Prepare response
         response = {
             "emotion": emotion,
             "confidence": round(confidence, 2),
             "music": combined_music,
             "subject": subject_suggestion,
+            "face": face,
+            "next_capture_ms": next_capture_ms,
             "timestamp": datetime.now().isoformat()
         }
+        if faces is not None:
+            response["faces"] = faces
         
         return jsonify(response)
     
@@ -107,6 +188,125 @@ def detect_emotion():
         print(f"Error in detect_emotion: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
 
+@app.route('/detect-emotion/batch', methods=['POST'])
+def detect_emotion_batch():
+    """
+    Batch emotion detection for clients that buffer several frames
+    Accepts either:
+    1. JSON {"images": [...]} with base64 data URLs
+    2. multipart/form-data with one or more 'images' file parts
+    Frames are decoded and detected in one pass; recommendations and
+    logging run once for the aggregated emotion
+    Add ?faces=all (or "all_faces": true) to get results for every face
+    """
+    try:
+        if request.files:
+            data = request.form
+            images = [f.read() for f in request.files.getlist('images')]
+        else:
+            data = request.get_json(silent=True) or {}
+            images = data.get('images', [])
+        
+        if not isinstance(images, list):
+            return jsonify({"error": "'images' must be a list"}), 400
+        
+        if not images:
+            return jsonify({"error": "No images provided"}), 400
+        
+        if len(images) > MAX_BATCH_FRAMES:
+            return jsonify({"error": f"At most {MAX_BATCH_FRAMES} images per batch"}), 413
+        
+        # Detect emotion for every frame, spread across the worker pool
+        all_faces = wants_all_faces(data)
+        # One deadline for the whole batch, slot waits included; a slow
+        # frame only fails itself
+        deadline = time.monotonic() + DETECTION_TIMEOUT
+        futures = [detection_pool.submit(payload, all_faces=all_faces, block=True,
+                                         timeout=max(deadline - time.monotonic(), 0))
+                   for payload in images]
+        
+        frames = []
+        for future in futures:
+            if future is None:
+                outcome = {"error": "Server busy"}
+            else:
+                try:
+                    outcome = future.result(timeout=max(deadline - time.monotonic(), 0))
+                except FutureTimeoutError:
+                    outcome = {"error": "Detection timed out"}
+            if 'error' in outcome:
+                frames.append({"error": outcome['error']})
+                continue
+            
+            frame = {
+                "emotion": outcome['emotion'],
+                "confidence": round(outcome['confidence'], 2),
+                "face": outcome['face']
+            }
+            if all_faces:
+                frame["faces"] = outcome['faces']
+            frames.append(frame)
+        
+        emotion, confidence = aggregate_emotions(frames)
+        if not emotion:
+            return jsonify({"error": "Could not detect emotion", "frames": frames}), 400
+        
+        # Recommendations and logging once per batch
+        music_recommendations = youtube_client.get_recommendations(emotion)
+        subject_suggestion = subject_suggester.get_suggestion(emotion)
+        data_logger.log_emotion(emotion, confidence, {'batch_size': len(images)})
+        
+        response = {
+            "emotion": emotion,
+            "confidence": round(confidence, 2),
+            "frames": frames,
+            "music": {
+                'emotion': emotion,
+                'confidence': round(confidence, 2),
+                'youtube_recommendations': music_recommendations,
+                'source': 'youtube'
+            },
+            "subject": subject_suggestion,
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        return jsonify(response)
+    
+    except Exception as e:
+        print(f"Error in detect_emotion_batch: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+def wants_all_faces(data):
+    """True if the request asked for per-face results (?faces=all or all_faces)"""
+    if request.args.get('faces') == 'all':
+        return True
+    return is_true(data.get('all_faces', False) if hasattr(data, 'get') else False)
+
+def is_true(value):
+    """JSON true or the string "true" (any case); "false", 0 and the like are not"""
+    return value is True or str(value).lower() == 'true'
+
+def aggregate_emotions(frames):
+    """
+    Combine per-frame results into one emotion
+    Each emotion is weighted by the summed confidence of its frames
+    Returns: (emotion, confidence) or (None, 0.0) if no frame was usable
+    """
+    weights = {}
+    counts = {}
+    for result in frames:
+        if 'emotion' not in result:
+            continue
+        emotion = result['emotion']
+        weights[emotion] = weights.get(emotion, 0.0) + result['confidence']
+        counts[emotion] = counts.get(emotion, 0) + 1
+    
+    if not weights:
+        return None, 0.0
+    
+    emotion = max(weights, key=weights.get)
+    return emotion, weights[emotion] / counts[emotion]
+
 @app.route('/emotion-timeline', methods=['GET'])
 def get_emotion_timeline():
     """Get emotion timeline data for graphs"""
@@ -128,6 +328,34 @@ def clear_timeline():
         print(f"Error in clear_timeline: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
 
+@app.route('/startup-timing', methods=['GET'])
+def startup_timing_report():
+    """Import and initialisation timings of this server process"""
+    return jsonify(startup_report())
+
+@app.route('/detector/stats', methods=['GET'])
+def detector_stats():
+    """Detection pool size, how often each detector tier ran and face tracking hit rate"""
+    stats = detection_pool.get_stats()
+    stats['tracking'] = tracking_stats()
+    return jsonify(stats)
+
+def tracking_stats():
+    """Tracked vs full-frame face detections across all sessions"""
+    totals = dict(retired_tracking)
+    for tracker in list(face_trackers.values()):
+        for name, count in tracker.get_stats().items():
+            totals[name] += count
+    detections = totals['tracked_frames'] + totals['full_detections']
+    totals['tracked_share'] = round(totals['tracked_frames'] / detections, 3) if detections else 0.0
+    totals['active_sessions'] = len(face_trackers)
+    return totals
+
+@app.route('/frame-gate/stats', methods=['GET'])
+def frame_gate_stats():
+    """Near-duplicate frame suppression hit/miss counters"""
+    return jsonify(frame_gate.get_stats())
+
 @app.route('/youtube/status', methods=['GET'])
 def youtube_status():
     """Check YouTube integration status"""
@@ -140,6 +368,11 @@ def youtube_status():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/youtube/cache/stats', methods=['GET'])
+def youtube_cache_stats():
+    """YouTube response cache hit/miss statistics"""
+    return jsonify(youtube_client.get_cache_stats())
+
 @app.route('/youtube/search', methods=['GET'])
 def search_youtube():
     """Search YouTube for playlists"""
@@ -178,11 +411,28 @@ def get_youtube_recommendations(emotion):
 @socketio.on('connect')
 def handle_connect():
     print(f'Client connected: {request.sid}')
+    active_sessions.add(request.sid)
+    if FACE_TRACKING:
+        face_trackers[request.sid] = FaceTracker()
     emit('connected', {'status': 'connected'})
 
 @socketio.on('disconnect') 
 def handle_disconnect():
     print(f'Client disconnected: {request.sid}')
+    active_sessions.discard(request.sid)
+    forget_session(request.sid)
+
+def forget_session(sid):
+    """Drop every piece of per-session state"""
+    frame_gate.forget(sid)
+    tracker = face_trackers.pop(sid, None)
+    if tracker is not None:
+        for name, count in tracker.get_stats().items():
+            retired_tracking[name] += count
+    frame_mailbox.forget(sid)
+    emotion_smoother.forget(sid)
+    capture_pacer.forget(sid)
+    session_recommendations.pop(sid, None)
 
 @socketio.on('start_emotion_detection')
 def handle_start_emotion_detection():
@@ -195,28 +445,112 @@ def handle_stop_emotion_detection():
 @socketio.on('analyze_frame')
 def handle_analyze_frame(data):
     try:
-        # Decode base64 image
-        image_data = data['image'].split(',')[1]
-        image_bytes = base64.b64decode(image_data)
+        # Frames arrive as a binary attachment or a legacy base64 string
+        if isinstance(data, dict):
+            frame = (data.get('image'), is_true(data.get('all_faces', False)))
+        else:
+            frame = (data, False)
+        sid = request.sid
         
-        # Convert to numpy array
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        # Latest frame wins: while a frame is being analysed, newer frames
+        # replace the waiting one instead of queueing up behind it
+        if frame_mailbox.offer(sid, frame):
+            socketio.start_background_task(process_session_frames, sid, frame)
         
-        if frame is None:
-            emit('emotion_result', {'error': 'Invalid image'})
+    except Exception as e:
+        print(f'Error in real-time analysis: {e}')
+        emit('emotion_result', {'error': str(e)})
+
+def process_session_frames(sid, frame):
+    """Analyse a session's (payload, all_faces) frames one at a time until its mailbox is empty"""
+    try:
+        while frame is not None:
+            payload, all_faces = frame
+            # The frame gate reference lets the worker skip near-duplicates
+            future = submit_session_frame(sid, payload, all_faces, frame_gate.reference(sid))
+            if future is None:
+                emit_frame_result(sid, {'error': 'Server busy, frame dropped'})
+            else:
+                finish_frame_analysis(sid, future, payload, all_faces)
+            
+            frame = frame_mailbox.next(sid)
+    except Exception as e:
+        # e.g. BrokenProcessPool from submit
+        print(f'Error in real-time analysis: {e}')
+        emit_frame_result(sid, {'error': f'Frame analysis failed: {e}'})
+    finally:
+        # Never leave the session marked busy, or it would get no more results
+        if frame is not None:
+            frame_mailbox.release(sid)
+
+def submit_session_frame(sid, payload, all_faces, reference_hash):
+    """Queue one of a session's frames in the detection pool; None if the pool is full"""
+    return detection_pool.submit(payload, face_trackers.get(sid),
+                                 reference_hash, frame_gate.threshold, all_faces,
+                                 block=True, timeout=DETECTION_TIMEOUT)
+
+def emit_frame_result(sid, result):
+    """Send an emotion_result to one session with its dropped-frame counts"""
+    dropped, dropped_total = frame_mailbox.take_dropped(sid)
+    socketio.emit('emotion_result', dict(result, dropped_frames=dropped, dropped_frames_total=dropped_total), to=sid)
+
+def finish_frame_analysis(sid, future, payload, all_faces):
+    """Wait for a pooled detection and emit its result to the client"""
+    try:
+        outcome = future.result()
+        if sid not in active_sessions:
+            # Disconnected while the frame was analysed
             return
         
-        # Detect emotion
-        emotion, confidence = emotion_detector.detect_emotion(frame)
+        if 'error' in outcome:
+            emit_frame_result(sid, {'error': outcome['error']})
+            return
         
-        # Get music recommendations
-        music_recommendations = youtube_client.get_recommendations(emotion)
+        # Near-duplicate of the last frame: reuse its result
+        if outcome.get('duplicate'):
+            cached = frame_gate.cached(sid)
+            if cached is not None:
+                next_capture_ms = capture_pacer.next_delay(sid, cached['emotion'], cached['face'] is not None)
+                emit_frame_result(sid, dict(cached, cached=True, next_capture_ms=next_capture_ms,
+                                            timestamp=datetime.now().isoformat()))
+                return
+            
+            # The cached result went away meanwhile: analyse the frame after all
+            future = submit_session_frame(sid, payload, all_faces, None)
+            if future is None:
+                emit_frame_result(sid, {'error': 'Server busy, frame dropped'})
+                return
+            outcome = future.result()
+            if sid not in active_sessions:
+                return
+            if 'error' in outcome:
+                emit_frame_result(sid, {'error': outcome['error']})
+                return
         
-        # Get subject suggestions  
-        subject_suggestion = subject_suggester.get_suggestion(emotion)
+        # Keep the tracker state the worker advanced
+        if sid in face_trackers:
+            face_trackers[sid] = outcome['tracker']
+        
+        emotion = outcome['emotion']
+        confidence = outcome['confidence']
         
-        # Log the emotion data
+        # Smooth the raw label so single-frame flips don't change recommendations
+        smoothed = emotion_smoother.update(sid, emotion, confidence) if EMOTION_SMOOTHING else None
+        recommend_for = smoothed['stable_emotion'] if smoothed else emotion
+        
+        cached_recommendations = session_recommendations.get(sid)
+        if cached_recommendations is not None and cached_recommendations[0] == recommend_for:
+            # Emotion unchanged: reuse the session's music and subject
+            _, music_recommendations, subject_suggestion = cached_recommendations
+        else:
+            # Get music recommendations
+            music_recommendations = youtube_client.get_recommendations(recommend_for)
+            
+            # Get subject suggestions  
+            subject_suggestion = subject_suggester.get_suggestion(recommend_for)
+            session_recommendations[sid] = (recommend_for, music_recommendations, subject_suggestion)
+        
+        # Log the raw emotion data
         data_logger.log_emotion(emotion, confidence)
         
         # Prepare response
@@ -225,15 +559,31 @@ def handle_analyze_frame(data):
             'confidence': round(confidence, 2),
             'music': music_recommendations,
             'subject': subject_suggestion,
+            'face': outcome['face'],
             'timestamp': datetime.now().isoformat()
         }
+        if 'faces' in outcome:
+            result['faces'] = outcome['faces']
+        if smoothed:
+            result['stable_emotion'] = smoothed['stable_emotion']
+            result['stable_confidence'] = round(smoothed['stable_confidence'], 2)
+        
+        frame_gate.store(sid, outcome['hash'], result)
         
-        # Send result to client
-        emit('emotion_result', result)
+        # Send result to client with the recommended delay before the next frame
+        next_capture_ms = capture_pacer.next_delay(sid, emotion, outcome['face'] is not None)
+        result = dict(result, next_capture_ms=next_capture_ms)
+        if smoothed:
+            result['stable_changed'] = smoothed['stable_changed']
+        emit_frame_result(sid, result)
+        
+        if sid not in active_sessions:
+            # Disconnected between the check above and the stores
+            forget_session(sid)
         
     except Exception as e:
         print(f'Error in real-time analysis: {e}')
-        emit('emotion_result', {'error': str(e)})
+        emit_frame_result(sid, {'error': str(e)})
 
 @socketio.on('get_emotion_timeline')
 def handle_get_emotion_timeline():
@@ -244,5 +594,7 @@ def handle_get_emotion_timeline():
         emit('emotion_timeline_error', {'error': str(e)})
 
 if __name__ == '__main__':
+    print_startup_report()
+    start_background_tasks(use_reloader=True)
     print('Starting Flask-SocketIO server...')
     socketio.run(app, host='0.0.0.0', port=5000, debug=True)
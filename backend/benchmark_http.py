@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the pooled HTTP session layer
+Starts a local stub of the YouTube and Spotify APIs that adds a fixed
+delay to every new connection (standing in for the TCP + TLS handshake to
+a remote API), then compares one-off requests.get calls with the shared
+keep-alive session, compares single and concurrent YouTube playlist
+fetching, and checks that a hung upstream times out.
+
+Usage:
+    python benchmark_http.py [--requests 50] [--handshake-ms 50]
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from http_session import create_session
+
+HANG_SECONDS = 30
+
+# Fan-out scenario: per-playlist latency, and playlists that come back empty
+PLAYLIST_DELAY = 0.0
+EMPTY_PLAYLISTS = set()
+
+
+class StubAPIHandler(BaseHTTPRequestHandler):
+    """Canned YouTube/Spotify responses over keep-alive HTTP/1.1"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path == '/hang':
+            time.sleep(HANG_SECONDS)
+            body = {}
+        elif path.endswith('/search'):
+            body = {'items': [{
+                'id': {'playlistId': f'PL{i}'},
+                'snippet': {'title': f'Playlist {i}', 'description': '', 'channelTitle': 'Stub', 'thumbnails': {}}
+            } for i in range(3)]}
+        else:
+            time.sleep(PLAYLIST_DELAY)
+            playlist_id = parse_qs(urlparse(self.path).query).get('playlistId', ['PL'])[0]
+            body = {'items': [] if playlist_id in EMPTY_PLAYLISTS else [{
+                'contentDetails': {'videoId': f'{playlist_id}-video{i}'},
+                'snippet': {'title': f'Video {i}', 'description': '', 'channelTitle': 'Stub', 'thumbnails': {}}
+            } for i in range(5)]}
+        self._send_json(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._send_json({'access_token': 'stub-token', 'expires_in': 3600})
+
+    def _send_json(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """Adds handshake_ms to every newly accepted connection"""
+
+    daemon_threads = True
+    handshake_ms = 0
+    connections = 0
+
+    def get_request(self):
+        request = super().get_request()
+        self.connections += 1
+        time.sleep(self.handshake_ms / 1000)
+        return request
+
+
+def timed_calls(get, url, count):
+    """Mean milliseconds per call"""
+    started = time.perf_counter()
+    for _ in range(count):
+        get(url, params={'q': 'happy', 'key': 'stub'}, timeout=10).raise_for_status()
+    return (time.perf_counter() - started) * 1000 / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled HTTP sessions against a local stub API")
+    parser.add_argument('--requests', type=int, default=50, help="Requests per scenario (default: 50)")
+    parser.add_argument('--handshake-ms', type=float, default=50, help="Simulated cost of a new connection (default: 50)")
+    args = parser.parse_args()
+
+    server = StubServer(('127.0.0.1', 0), StubAPIHandler)
+    server.handshake_ms = args.handshake_ms
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+
+    print("🧪 HTTP session benchmark")
+    print("=" * 60)
+    print(f"Stub API at {base_url}, {args.handshake_ms:.0f} ms per new connection")
+
+    server.connections = 0
+    unpooled = timed_calls(requests.get, f'{base_url}/search', args.requests)
+    unpooled_connections = server.connections
+
+    session = create_session()
+    server.connections = 0
+    pooled = timed_calls(session.get, f'{base_url}/search', args.requests)
+    pooled_connections = server.connections
+
+    print(f"requests.get      : {unpooled:7.1f} ms/request, {unpooled_connections} connections")
+    print(f"pooled session    : {pooled:7.1f} ms/request, {pooled_connections} connections")
+    print(f"speedup           : {unpooled / pooled:7.1f}x")
+
+    # End to end: uncached YouTube recommendations through the shared session
+    os.environ.setdefault('YOUTUBE_API_KEY', 'stub')
+    os.environ['API_CACHE'] = 'false'
+    os.environ['YOUTUBE_CACHE_TTL'] = '0'
+    from youtube_integration import YouTubeIntegration
+    youtube = YouTubeIntegration()
+    youtube.base_url = base_url
+    youtube.get_recommendations('happy')
+    started = time.perf_counter()
+    for _ in range(10):
+        youtube.get_recommendations('happy')
+    print(f"YouTube recommendations (uncached): {(time.perf_counter() - started) * 100:.1f} ms each")
+
+    # Fan-out: 3 candidate playlists, 100 ms each, the top one empty
+    global PLAYLIST_DELAY
+    PLAYLIST_DELAY = 0.1
+    EMPTY_PLAYLISTS.add('PL0')
+    for mode in ('single', 'concurrent'):
+        youtube.fetch_mode = mode
+        youtube.cache.clear()
+        started = time.perf_counter()
+        recommendations = youtube.get_recommendations('happy')
+        ids = [track['youtube_id'] for track in recommendations['tracks']]
+        source = 'fallback tracks' if ids[0] is None else f"{len(set(ids))} unique videos"
+        print(f"YouTube {mode:<10}: {(time.perf_counter() - started) * 1000:6.1f} ms, {source}")
+    PLAYLIST_DELAY = 0.0
+    EMPTY_PLAYLISTS.clear()
+
+    # Spotify: token request plus searches over the same shared session
+    from spotify_integration import SpotifyIntegration
+    spotify = SpotifyIntegration()
+    spotify.client_id, spotify.client_secret = 'stub', 'stub'
+    spotify.auth_url = f'{base_url}/token'
+    spotify.base_url = base_url
+    spotify._authenticate()
+    started = time.perf_counter()
+    for _ in range(10):
+        spotify.search_tracks('happy')
+    print(f"Spotify track searches: {(time.perf_counter() - started) * 100:.1f} ms each")
+
+    # A hung upstream must fail after the read timeout instead of blocking
+    hung = create_session(retries=0, timeout=(1, 1))
+    started = time.perf_counter()
+    try:
+        hung.get(f'{base_url}/hang')
+        print("❌ Hung request returned")
+    except requests.Timeout:
+        print(f"✅ Hung upstream timed out after {time.perf_counter() - started:.1f}s (read timeout 1s)")
+
+    print("=" * 60)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+
+
+class CapturePacer:
+    """
+    Per-session recommended delay before the client captures its next frame
+    A stability estimate (moving average of "same emotion as last frame")
+    is kept per session. Stable emotions and frames without a face push the
+    delay towards max_delay; a change drops it straight to min_delay, so
+    server load follows what is actually happening in front of the camera.
+    """
+
+    def __init__(self, min_delay=None, max_delay=None, rate=0.25, idle_timeout=600):
+        """
+        Args:
+            min_delay (int): Delay in ms right after the emotion changes
+            max_delay (int): Delay in ms once the session is fully stable
+            rate (float): How fast stability builds up per unchanged frame (0-1)
+            idle_timeout (float): Seconds after which an inactive session is dropped
+        """
+        self.min_delay = min_delay if min_delay is not None else int(os.getenv('CAPTURE_MIN_DELAY_MS', 500))
+        self.max_delay = max_delay if max_delay is not None else int(os.getenv('CAPTURE_MAX_DELAY_MS', 8000))
+        self.rate = rate
+        self.idle_timeout = idle_timeout
+
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self.last_prune = time.time()
+
+    def next_delay(self, session_id, emotion, face_found=True):
+        """
+        Update the session with its latest result
+        Returns: recommended delay in milliseconds before the next capture
+        """
+        now = time.time()
+        with self.lock:
+            self._prune(now)
+
+            state = self.sessions.get(session_id)
+            if state is None:
+                state = self.sessions[session_id] = {'emotion': None, 'stability': 0.0}
+
+            if face_found and emotion != state['emotion']:
+                # Something changed: sample fast until it settles
+                state['stability'] = 0.0
+            else:
+                # Same emotion, or nobody in front of the camera: back off
+                state['stability'] += self.rate * (1.0 - state['stability'])
+
+            if face_found:
+                state['emotion'] = emotion
+            state['last_seen'] = now
+
+            return int(self.min_delay + (self.max_delay - self.min_delay) * state['stability'])
+
+    def _prune(self, now):
+        """Drop sessions idle for longer than idle_timeout (checked at most once a minute)"""
+        if now - self.last_prune < 60:
+            return
+        self.last_prune = now
+        for session_id in [s for s, state in self.sessions.items() if now - state['last_seen'] > self.idle_timeout]:
+            del self.sessions[session_id]
+
+    def forget(self, session_id):
+        """Drop pacing state for a disconnected session"""
+        with self.lock:
+            self.sessions.pop(session_id, None)
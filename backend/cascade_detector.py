@@ -0,0 +1,109 @@
+import os
+from frame_context import FrameContext, as_frame_context
+
+# Margin around the cheap tier's face box given to the expensive tier,
+# as a fraction of the box size
+ESCALATION_PADDING = 0.5
+
+
+class CascadeEmotionDetector:
+    """
+    Confidence-gated cascade of two detector backends
+    The cheap tier runs on every frame. The expensive tier runs only when
+    the cheap result is below CASCADE_THRESHOLD or, for sessions with a
+    FaceTracker, when the cheap emotion differs from the previous frame's.
+    The previous emotion lives on the tracker, so with FACE_TRACKING off
+    (and for HTTP requests) escalation is on confidence alone.
+    On escalation the expensive tier only sees the region around the
+    cheap tier's face, cut from the shared FrameContext, so it classifies
+    the same face and reuses the grayscale conversion.
+    """
+
+    def __init__(self, cheap=None, expensive=None, threshold=None):
+        """
+        Args:
+            cheap (str): Backend name of the first tier (CASCADE_CHEAP, default 'simple')
+            expensive (str): Backend name of the escalation tier (CASCADE_EXPENSIVE, default 'advanced')
+            threshold (float): Cheap-tier confidence below which the expensive tier runs
+        """
+        # Imported here: detector_backends registers this class
+        from detector_backends import detector_class
+
+        cheap = cheap or os.getenv('CASCADE_CHEAP', 'simple')
+        expensive = expensive or os.getenv('CASCADE_EXPENSIVE', 'advanced')
+        self.threshold = threshold if threshold is not None else float(os.getenv('CASCADE_THRESHOLD', 0.7))
+
+        self.cheap = detector_class(cheap)()
+        self.expensive = detector_class(expensive)()
+
+        # Gray decoding is only possible if both tiers accept it
+        self.gray_input = self.cheap.gray_input and self.expensive.gray_input
+
+        self.tier_counts = {'cheap': 0, 'expensive': 0}
+        self.last_tier = None
+        print(f"✅ Cascade emotion detector initialized ({cheap} → {expensive} below {self.threshold:.2f})")
+
+    def detect_emotion(self, frame):
+        """
+        Cascaded emotion detection
+        Returns: (emotion, confidence)
+        """
+        emotion, confidence, _ = self.analyze(frame)
+        return emotion, confidence
+
+    def analyze(self, frame, scale=1, tracker=None):
+        """
+        Cascaded detection for the largest face
+        Returns: (emotion, confidence, face); last_tier tells which tier answered
+        """
+        ctx = as_frame_context(frame)
+        emotion, confidence, face = self.cheap.analyze(ctx, scale, tracker)
+
+        previous = tracker.last_emotion if tracker is not None else None
+        if tracker is not None:
+            tracker.last_emotion = emotion
+
+        # No face (or a dark frame) gives the expensive tier nothing to improve on
+        changed = previous is not None and emotion != previous
+        if face is None or (confidence >= self.threshold and not changed):
+            self._count('cheap')
+            return emotion, confidence, face
+
+        self._count('expensive')
+        # The cheap tier already advanced the tracker and found the face box
+        emotion, confidence, _ = self.expensive.analyze(self._face_region(ctx, face, scale), scale)
+        return emotion, confidence, face
+
+    def _face_region(self, ctx, face, scale):
+        """FrameContext over the padded face box (given in original pixels)"""
+        x, y, w, h = (int(v / scale) for v in face)
+        pad_x, pad_y = int(w * ESCALATION_PADDING), int(h * ESCALATION_PADDING)
+        height, width = ctx.gray.shape[:2]
+        x0, y0 = max(x - pad_x, 0), max(y - pad_y, 0)
+        x1, y1 = min(x + w + pad_x, width), min(y + h + pad_y, height)
+
+        # Views into the shared frame, no copies
+        region = FrameContext(ctx.frame[y0:y1, x0:x1], ctx.clahe)
+        region.gray = ctx.gray[y0:y1, x0:x1]
+        return region
+
+    def analyze_faces(self, frame, scale=1):
+        """
+        Cascaded multi-face detection; escalates the whole frame when any
+        face is below the threshold
+        Returns: (emotion, confidence, face, faces)
+        """
+        ctx = as_frame_context(frame)
+        result = self.cheap.analyze_faces(ctx, scale)
+        faces = result[3]
+
+        if not faces or min(f['confidence'] for f in faces) >= self.threshold:
+            self._count('cheap')
+            return result
+
+        self._count('expensive')
+        return self.expensive.analyze_faces(ctx, scale)
+
+    def _count(self, tier):
+        self.tier_counts[tier] += 1
+        self.last_tier = tier
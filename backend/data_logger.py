@@ -38,23 +38,8 @@ class DataLogger:
             with open(self.data_file, 'r') as f:
                 data = json.load(f)
             
-            # Create emotion entry
-            emotion_entry = {
-                'emotion': emotion,
-                'confidence': confidence,
-                'timestamp': datetime.now().isoformat(),
-                'date': datetime.now().strftime('%Y-%m-%d'),
-                'time': datetime.now().strftime('%H:%M:%S'),
-                'hour': datetime.now().hour,
-                'day_of_week': datetime.now().strftime('%A')
-            }
-            
-            # Add additional data if provided
-            if additional_data:
-                emotion_entry.update(additional_data)
-            
             # Append to emotions list
-            data['emotions'].append(emotion_entry)
+            data['emotions'].append(self._create_entry(emotion, confidence, datetime.now(), additional_data))
             
             # Update statistics
             self._update_statistics(data)
@@ -68,6 +53,60 @@ class DataLogger:
         except Exception as e:
             print(f"❌ Error logging emotion: {str(e)}")
     
+    def log_emotions(self, entries):
+        """
+        Log many emotions in one read/write of the data file
+        
+        Args:
+            entries (list): Dicts with 'emotion', 'confidence', 'timestamp'
+                (datetime) and optional 'additional_data'
+            
+        Returns:
+            int: Number of entries written
+        """
+        
+        try:
+            with open(self.data_file, 'r') as f:
+                data = json.load(f)
+            
+            for entry in entries:
+                data['emotions'].append(self._create_entry(
+                    entry['emotion'], entry['confidence'],
+                    entry['timestamp'], entry.get('additional_data')
+                ))
+            
+            # Statistics are recomputed once for the whole batch
+            self._update_statistics(data)
+            
+            with open(self.data_file, 'w') as f:
+                json.dump(data, f, indent=2)
+            
+            print(f"✅ Logged {len(entries)} emotions")
+            return len(entries)
+        
+        except Exception as e:
+            print(f"❌ Error logging emotions: {str(e)}")
+            return 0
+    
+    def _create_entry(self, emotion, confidence, timestamp, additional_data=None):
+        """Build a timeline entry for an emotion detected at timestamp"""
+        
+        emotion_entry = {
+            'emotion': emotion,
+            'confidence': confidence,
+            'timestamp': timestamp.isoformat(),
+            'date': timestamp.strftime('%Y-%m-%d'),
+            'time': timestamp.strftime('%H:%M:%S'),
+            'hour': timestamp.hour,
+            'day_of_week': timestamp.strftime('%A')
+        }
+        
+        # Add additional data if provided
+        if additional_data:
+            emotion_entry.update(additional_data)
+        
+        return emotion_entry
+    
     def get_timeline(self, days=7):
         """
         Get emotion timeline data for the last N days
@@ -0,0 +1,194 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from frame_context import FrameContext
+from frame_decoder import decode_frame_for
+from frame_gate import frame_hash, is_duplicate
+from startup_timing import print_startup_report
+
+# Detector owned by this process (each pool worker builds its own)
+_detector = None
+
+
+def _init_worker(detector_factory):
+    """Pool initializer: build the detector once per worker process"""
+    global _detector
+    _detector = detector_factory()
+    if multiprocessing.parent_process() is not None:
+        print_startup_report("Detection worker startup")
+
+
+def analyze_payload(payload, tracker=None, reference_hash=None, threshold=0, all_faces=False):
+    """
+    Decode and analyse one encoded frame
+    Runs inside a worker process, so everything passed in and returned
+    must be picklable
+    Args:
+        payload: Raw image bytes or base64 data URL
+        tracker (FaceTracker): Session face tracker, returned updated
+        reference_hash: Hash of the session's last analysed frame, if fresh
+        threshold (int): Max hash distance for a frame to count as a duplicate
+        all_faces (bool): Also return per-face results for every face
+    Returns:
+        dict: {'error'} for undecodable frames, {'duplicate', 'hash'} for
+        near-duplicates, otherwise emotion, confidence, face, hash, tracker
+        (plus faces when all_faces is set, and tier for cascading detectors)
+    """
+    frame, scale = decode_frame_for(payload, _detector)
+    if frame is None:
+        return {'error': 'Invalid image'}
+
+    # One context per frame: the hash and the detector share its grayscale image
+    ctx = FrameContext(frame)
+    new_hash = frame_hash(ctx.gray)
+    if is_duplicate(reference_hash, new_hash, threshold):
+        return {'duplicate': True, 'hash': new_hash}
+
+    if all_faces:
+        emotion, confidence, face, faces = _detector.analyze_faces(ctx, scale)
+    else:
+        emotion, confidence, face = _detector.analyze(ctx, scale, tracker)
+
+    result = {
+        'emotion': emotion,
+        'confidence': confidence,
+        'face': face,
+        'hash': new_hash,
+        'tracker': tracker
+    }
+    if all_faces:
+        result['faces'] = faces
+    tier = getattr(_detector, 'last_tier', None)
+    if tier is not None:
+        result['tier'] = tier
+    return result
+
+
+class DetectionPool:
+    """
+    Process pool for frame decoding and emotion detection
+    Keeps CPU-heavy work off the Flask/Socket.IO workers so every core can
+    run detection while the server keeps answering other requests.
+    """
+
+    def __init__(self, detector_factory, workers=None, max_pending=None):
+        """
+        Args:
+            detector_factory (callable): Builds the detector inside each worker
+            workers (int): Worker processes; 0 runs detection inline
+            max_pending (int): Frames allowed in flight before submit() refuses more
+        """
+        self.detector_factory = detector_factory
+        self.workers = workers if workers is not None else int(os.getenv('DETECTION_WORKERS', os.cpu_count() or 1))
+        self.max_pending = max_pending if max_pending is not None else int(os.getenv('DETECTION_QUEUE_SIZE', max(self.workers, 1) * 2))
+
+        self.slots = threading.BoundedSemaphore(self.max_pending)
+        self.executor = None
+        self.lock = threading.Lock()
+
+        # How often each detector tier answered (cascading detectors only);
+        # counted here because every worker process has its own detector
+        self.tier_counts = {}
+        # Pools replaced after a worker process died
+        self.restarts = 0
+
+    def _get_executor(self):
+        """Start worker processes on first use"""
+        with self.lock:
+            if self.executor is None:
+                # spawn avoids forking a process that already runs server threads
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.detector_factory,)
+                )
+                print(f"✅ Detection pool started with {self.workers} worker processes")
+            return self.executor
+
+    def _discard_executor(self, executor):
+        """
+        Drop a broken pool (a worker died, e.g. OOM kill or a native crash)
+        so the next submit starts a fresh one; a pool that already replaced
+        it is left alone
+        """
+        with self.lock:
+            if executor is None or self.executor is not executor:
+                return
+            self.executor = None
+            self.restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+        print("⚠️ Detection worker died; restarting the detection pool")
+
+    def submit(self, payload, tracker=None, reference_hash=None, threshold=0, all_faces=False,
+               block=False, timeout=None):
+        """
+        Queue a frame for analysis
+        Returns a Future resolving to analyze_payload's result, or None when
+        the queue is full (non-blocking) or no slot freed up within timeout
+        """
+        acquired = self.slots.acquire(timeout=timeout) if block else self.slots.acquire(blocking=False)
+        if not acquired:
+            return None
+
+        try:
+            if self.workers <= 0:
+                future = Future()
+                if _detector is None:
+                    _init_worker(self.detector_factory)
+                try:
+                    future.set_result(analyze_payload(payload, tracker, reference_hash, threshold, all_faces))
+                except Exception as e:
+                    future.set_exception(e)
+            else:
+                executor = self._get_executor()
+                try:
+                    future = executor.submit(analyze_payload, payload, tracker, reference_hash, threshold, all_faces)
+                except BrokenProcessPool:
+                    # Retry once on a fresh pool
+                    self._discard_executor(executor)
+                    executor = self._get_executor()
+                    future = executor.submit(analyze_payload, payload, tracker, reference_hash, threshold, all_faces)
+        except Exception:
+            self.slots.release()
+            raise
+
+        future.add_done_callback(partial(self._on_done, executor if self.workers > 0 else None))
+        return future
+
+    def _on_done(self, executor, future):
+        self.slots.release()
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            if isinstance(future.exception(), BrokenProcessPool):
+                self._discard_executor(executor)
+            return
+        tier = future.result().get('tier')
+        if tier is not None:
+            with self.lock:
+                self.tier_counts[tier] = self.tier_counts.get(tier, 0) + 1
+
+    def get_stats(self):
+        """Pool size and detector tier counters"""
+        with self.lock:
+            tiers = dict(self.tier_counts)
+        total = sum(tiers.values())
+        return {
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'restarts': self.restarts,
+            'tier_counts': tiers,
+            'tier_share': {tier: round(count / total, 3) for tier, count in tiers.items()} if total else {}
+        }
+
+    def shutdown(self):
+        """Stop worker processes"""
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
@@ -0,0 +1,54 @@
+"""
+Emotion detector backends, selectable with EMOTION_DETECTOR
+
+Every backend is a class with:
+    gray_input (bool): whether frames may be decoded straight to grayscale
+    detect_emotion(frame) -> (emotion, confidence)
+    analyze(frame, scale=1, tracker=None) -> (emotion, confidence, face)
+    analyze_faces(frame, scale=1) -> (emotion, confidence, face, faces)
+
+Backends are imported only when selected, so the heavy optional
+dependencies of one backend are never loaded for another.
+"""
+
+import importlib
+import os
+
+from startup_timing import timed
+
+# Backend name -> (module, class)
+DETECTOR_BACKENDS = {
+    'simple': ('simple_emotion_detector', 'EmotionDetector'),
+    'advanced': ('emotion_detector', 'EmotionDetector'),
+    'dnn': ('dnn_emotion_detector', 'DnnEmotionDetector'),
+    'cascade': ('cascade_detector', 'CascadeEmotionDetector'),
+}
+
+# Used when the configured backend cannot be built (missing model, library...)
+FALLBACK_DETECTOR = 'simple'
+
+
+def detector_class(name):
+    """Import and return the detector class registered under name"""
+    if name not in DETECTOR_BACKENDS:
+        raise ValueError(f"Unknown emotion detector '{name}', expected one of {', '.join(DETECTOR_BACKENDS)}")
+
+    module_name, class_name = DETECTOR_BACKENDS[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_detector(name=None):
+    """
+    Build the configured emotion detector (EMOTION_DETECTOR, default 'simple')
+    Falls back to the simple detector if the chosen backend fails to load.
+    Module-level so it can be pickled as a DetectionPool detector factory.
+    """
+    name = (name or os.getenv('EMOTION_DETECTOR', 'simple')).lower()
+    try:
+        with timed(f"create detector '{name}'"):
+            return detector_class(name)()
+    except Exception as e:
+        if name == FALLBACK_DETECTOR:
+            raise
+        print(f"❌ Could not load '{name}' emotion detector ({e}); using '{FALLBACK_DETECTOR}'")
+        return detector_class(FALLBACK_DETECTOR)()
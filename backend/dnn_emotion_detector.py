@@ -0,0 +1,159 @@
+import os
+import threading
+import cv2
+import numpy as np
+from frame_decoder import scale_box
+from face_detection import detect_faces, min_face_size
+from frame_context import as_frame_context
+
+# Emotion CNN in ONNX format, e.g. FER+ (emotion-ferplus-8.onnx from the ONNX model zoo)
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'emotion-ferplus.onnx')
+
+# Output classes of the FER+ model, in output order
+FERPLUS_LABELS = 'neutral,happy,surprise,sad,angry,disgust,fear,contempt'
+
+# Networks are loaded once per process and shared by every detector instance;
+# cv2.dnn.Net is not thread-safe, so forward passes are serialised per model
+_nets = {}
+_nets_lock = threading.Lock()
+
+
+def load_emotion_net(model_path):
+    """Return (net, lock) for model_path, reading the ONNX file on first use"""
+    with _nets_lock:
+        if model_path not in _nets:
+            if not os.path.exists(model_path):
+                raise IOError(f"Emotion model not found: {model_path}")
+            net = cv2.dnn.readNetFromONNX(model_path)
+            net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+            net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+            _nets[model_path] = (net, threading.Lock())
+        return _nets[model_path]
+
+
+class DnnEmotionDetector:
+    """Emotion CNN run on the CPU through OpenCV DNN (no TensorFlow needed)"""
+
+    # The model takes grayscale face crops, so frames can be decoded straight to gray
+    gray_input = True
+
+    # Network labels mapped onto the app's emotions (same as simple_emotion_detector)
+    emotion_mapping = {
+        'angry': 'stressed',
+        'disgust': 'stressed',
+        'fear': 'stressed',
+        'contempt': 'stressed',
+        'happy': 'happy',
+        'sad': 'sad',
+        'surprise': 'excited',
+        'neutral': 'neutral'
+    }
+
+    def __init__(self, model_path=None):
+        """
+        Load the ONNX model (once per process)
+        Input size, pixel scale and labels come from EMOTION_MODEL_INPUT_SIZE,
+        EMOTION_MODEL_SCALE and EMOTION_MODEL_LABELS; the defaults suit FER+
+        """
+        self.model_path = model_path or os.getenv('EMOTION_MODEL_PATH', DEFAULT_MODEL_PATH)
+        self.input_size = int(os.getenv('EMOTION_MODEL_INPUT_SIZE', 64))
+        self.pixel_scale = float(os.getenv('EMOTION_MODEL_SCALE', 1.0))
+        self.labels = os.getenv('EMOTION_MODEL_LABELS', FERPLUS_LABELS).split(',')
+
+        self.net, self.net_lock = load_emotion_net(self.model_path)
+        print(f"✅ DNN emotion detector initialized ({os.path.basename(self.model_path)})")
+
+    def detect_emotion(self, frame):
+        """
+        Emotion detection with the CNN
+        Returns: (emotion, confidence)
+        """
+        emotion, confidence, _ = self.analyze(frame)
+        return emotion, confidence
+
+    def analyze(self, frame, scale=1, tracker=None):
+        """
+        Emotion detection for the largest face
+        Same contract as simple_emotion_detector.EmotionDetector.analyze
+        Returns: (emotion, confidence, face)
+        """
+        try:
+            ctx = as_frame_context(frame)
+
+            # Check for black screen/camera issues
+            if ctx.brightness < 20:
+                return 'neutral', 0.1, None
+
+            min_face = min_face_size(scale)
+
+            def find_faces(image):
+                return detect_faces(image, 1.1, 5, min_size=min_face)
+
+            faces = tracker.detect(ctx.gray, find_faces) if tracker is not None else find_faces(ctx.gray)
+
+            if len(faces) == 0:
+                return 'neutral', 0.5, None
+
+            face = tuple(max(faces, key=lambda f: f[2] * f[3]))
+            emotion, confidence = self.classify_faces(ctx.gray, [face])[0]
+            return emotion, confidence, scale_box(face, scale)
+
+        except Exception as e:
+            print(f"DNN emotion detection error: {e}")
+            return 'neutral', 0.5, None
+
+    def analyze_faces(self, frame, scale=1):
+        """
+        Emotion detection for every face, all crops in one forward pass
+        Returns: (emotion, confidence, face, faces) as in
+        simple_emotion_detector.EmotionDetector.analyze_faces
+        """
+        try:
+            ctx = as_frame_context(frame)
+
+            if ctx.brightness < 20:
+                return 'neutral', 0.1, None, []
+
+            min_face = min_face_size(scale)
+            faces = detect_faces(ctx.gray, 1.1, 5, min_size=min_face)
+
+            if len(faces) == 0:
+                return 'neutral', 0.5, None, []
+
+            faces = sorted((tuple(f) for f in faces), key=lambda f: f[2] * f[3], reverse=True)
+            predictions = self.classify_faces(ctx.gray, faces)
+
+            results = [{
+                'box': scale_box(box, scale),
+                'emotion': emotion,
+                'confidence': confidence
+            } for box, (emotion, confidence) in zip(faces, predictions)]
+
+            largest = results[0]
+            return largest['emotion'], largest['confidence'], largest['box'], results
+
+        except Exception as e:
+            print(f"DNN emotion detection error: {e}")
+            return 'neutral', 0.5, None, []
+
+    def classify_faces(self, gray, faces):
+        """
+        Run the CNN on a batch of face boxes from one grayscale image
+        Returns: list of (emotion, confidence), one per face
+        """
+        crops = [gray[y:y + h, x:x + w] for (x, y, w, h) in faces]
+        blob = cv2.dnn.blobFromImages(crops, self.pixel_scale, (self.input_size, self.input_size),
+                                      swapRB=False, crop=False)
+
+        with self.net_lock:
+            self.net.setInput(blob)
+            logits = self.net.forward().reshape(len(crops), -1)
+
+        # Softmax over classes
+        logits = logits - logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+
+        best = probabilities.argmax(axis=1)
+        return [(self.emotion_mapping.get(self.labels[index], 'neutral'), float(probabilities[i, index]))
+                for i, index in enumerate(best)]
@@ -1,32 +1,19 @@
 import cv2
 import numpy as np
-import pandas as pd
-from sklearn.svm import SVC
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-# Try to import DeepFace library, but make it optional
-try:
-    from deepface import DeepFace
-    import cv2
-    DEEPFACE_AVAILABLE = True
-    print("✅ DeepFace library loaded successfully")
-except ImportError:
-    DeepFace = None
-    DEEPFACE_AVAILABLE = False
-    print("⚠️  DeepFace library not available. Using enhanced OpenCV detection only.")
-
-# Try to import dlib library, but make it optional
-try:
-    import dlib
-    DLIB_AVAILABLE = True
-    print("✅ dlib library loaded successfully")
-except ImportError:
-    dlib = None
-    DLIB_AVAILABLE = False
-    print("⚠️  dlib not available - using OpenCV fallback for face detection")
 
+# pandas, scikit-learn, DeepFace (TensorFlow) and dlib are imported only
+# when the component that needs them is first used, so the rule-based
+# path starts without loading them (see startup_timing.py)
 import os
 from typing import List, Tuple, Optional
+from face_detection import detect_faces, min_face_size
+from frame_context import FrameContext, as_frame_context
+from emotion_rules import EMOTIONS, FEATURES, feature_matrix, score_emotions
+from frame_decoder import scale_box
+from face_features import integral_feature_matrix, features_to_dicts
+from model_cache import artifact_key, load_artifact, save_artifact
+from landmark_geometry import geometry_features
+from startup_timing import load_module, module_available
 
 # Constants
 WHITE_COLOR = (255, 255, 255)
@@ -37,6 +24,11 @@ FRAME_WIDTH = 640
 FRAME_HEIGHT = 490
 NO_FACE_LABEL = "no face detected"
 
+
+def _dlib():
+    """dlib module, imported on first use; None when not installed"""
+    return load_module('dlib', optional=True)
+
 class BoundingBox:
     """Enhanced bounding box class for face detection"""
     def __init__(self, x: int, y: int, w: int, h: int):
@@ -64,7 +56,8 @@ class BoundingBox:
 class LandMarker:
     """Facial landmark detector using dlib (optional)"""
     def __init__(self, landmark_predictor_path: str):
-        if not DLIB_AVAILABLE:
+        dlib = _dlib()
+        if dlib is None:
             self.detector = None
             self.predictor = None
             print("⚠️  LandMarker disabled - dlib not available")
@@ -81,7 +74,7 @@ class LandMarker:
 
     def detect_landmarks(self, image: np.ndarray, face_rect) -> Optional[np.ndarray]:
         """Detect 68 facial landmarks"""
-        if not DLIB_AVAILABLE or self.detector is None or self.predictor is None:
+        if self.detector is None or self.predictor is None:
             return None
 
         try:
@@ -92,25 +85,33 @@ class LandMarker:
             print(f"Error detecting landmarks: {e}")
             return None
 
-    def get_face_rectangles(self, image: np.ndarray) -> List:
-        """Get face rectangles from image"""
-        if not DLIB_AVAILABLE or self.detector is None:
-            # Fallback to OpenCV face detection
-            face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            faces = face_cascade.detectMultiScale(gray, 1.1, 5, minSize=(50, 50))
+    def get_face_rectangles(self, image) -> List:
+        """Get face rectangles from an image or FrameContext"""
+        ctx = as_frame_context(image)
+        if self.detector is None:
+            # Fallback to OpenCV face detection on the shared grayscale image
+            faces = detect_faces(ctx.gray, 1.1, 5, min_size=(50, 50))
             # Convert to dlib-like rectangles
             return [(x, y, w, h) for (x, y, w, h) in faces]
 
-        return self.detector(image, 1)
+        return self.detector(ctx.frame, 1)
 
 class ImageClassifier:
     """Advanced image classifier using machine learning"""
+
+    # Hyperparameters per algorithm; part of the model cache key
+    MODEL_PARAMS = {
+        'RandomForest': {'n_estimators': 100, 'random_state': 42},
+        'SVM': {'kernel': 'rbf', 'C': 1.0, 'gamma': 'scale', 'random_state': 42},
+    }
+    SPLIT_PARAMS = {'test_size': 0.2, 'random_state': 42}
+
     def __init__(self, csv_path: str, algorithm: str = 'RandomForest', land_marker: Optional[LandMarker] = None):
         self.land_marker = land_marker
         self.algorithm = algorithm
         self.model = None
-        self.scaler = StandardScaler()
+        # Fitted in _train or loaded from the model cache
+        self.scaler = None
 
         # Emotion labels
         self.emotion_labels = {
@@ -122,43 +123,75 @@ class ImageClassifier:
         self.load_and_train(csv_path)
 
     def load_and_train(self, csv_path: str):
-        """Load dataset and train the classifier"""
+        """
+        Load the fitted scaler and model from the model cache, training
+        only when the CSV or hyperparameters have no cached artifact
+        """
         try:
-            print(f"[INFO] Loading dataset from {csv_path}")
-            data = pd.read_csv(csv_path)
-
-            # Assume the last column is the label, rest are features
-            X = data.iloc[:, :-1].values
-            y = data.iloc[:, -1].values
-
-            # Split the data
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-            # Scale the features
-            X_train_scaled = self.scaler.fit_transform(X_train)
-            X_test_scaled = self.scaler.transform(X_test)
-
-            # Train the model
-            if self.algorithm == 'RandomForest':
-                self.model = RandomForestClassifier(n_estimators=100, random_state=42)
-            elif self.algorithm == 'SVM':
-                self.model = SVC(kernel='rbf', C=1.0, gamma='scale', random_state=42)
-            else:
+            if self.algorithm not in self.MODEL_PARAMS:
                 raise ValueError(f"Unsupported algorithm: {self.algorithm}")
 
-            self.model.fit(X_train_scaled, y_train)
+            key = artifact_key(csv_path, {
+                'algorithm': self.algorithm,
+                'model': self.MODEL_PARAMS[self.algorithm],
+                'split': self.SPLIT_PARAMS
+            })
+
+            artifact = load_artifact(key)
+            if artifact is not None:
+                self.scaler = artifact['scaler']
+                self.model = artifact['model']
+                print(f"[INFO] Loaded cached {self.algorithm} model (accuracy {artifact['accuracy']:.2f})")
+                return
 
-            # Evaluate
-            y_pred = self.model.predict(X_test_scaled)
-            accuracy = accuracy_score(y_test, y_pred)
-            print(".2f")
+            accuracy = self._train(csv_path)
+            save_artifact(key, {'scaler': self.scaler, 'model': self.model, 'accuracy': accuracy})
 
         except Exception as e:
             print(f"[ERROR] Failed to train model: {e}")
             self.model = None
 
-    def classify(self, img: np.ndarray) -> List[str]:
-        """Classify emotions in the image"""
+    def _train(self, csv_path: str) -> float:
+        """Load dataset and train the classifier; returns test accuracy"""
+        pd = load_module('pandas')
+        train_test_split = load_module('sklearn.model_selection').train_test_split
+        accuracy_score = load_module('sklearn.metrics').accuracy_score
+
+        print(f"[INFO] Loading dataset from {csv_path}")
+        data = pd.read_csv(csv_path)
+
+        # Assume the last column is the label, rest are features
+        X = data.iloc[:, :-1].values
+        y = data.iloc[:, -1].values
+
+        # Split the data
+        X_train, X_test, y_train, y_test = train_test_split(X, y, **self.SPLIT_PARAMS)
+
+        # Scale the features
+        self.scaler = load_module('sklearn.preprocessing').StandardScaler()
+        X_train_scaled = self.scaler.fit_transform(X_train)
+        X_test_scaled = self.scaler.transform(X_test)
+
+        # Train the model
+        if self.algorithm == 'RandomForest':
+            self.model = load_module('sklearn.ensemble').RandomForestClassifier(**self.MODEL_PARAMS['RandomForest'])
+        else:
+            self.model = load_module('sklearn.svm').SVC(**self.MODEL_PARAMS['SVM'])
+
+        self.model.fit(X_train_scaled, y_train)
+
+        # Evaluate
+        y_pred = self.model.predict(X_test_scaled)
+        accuracy = accuracy_score(y_test, y_pred)
+        print(f"[INFO] Model accuracy: {accuracy:.2f}")
+        return float(accuracy)
+
+    def classify(self, img) -> List[str]:
+        """
+        Classify emotions in the image
+        img is either a preprocessed image or a FrameContext, in which case
+        its CLAHE-equalised image is used
+        """
         if self.model is None:
             return [NO_FACE_LABEL]
 
@@ -182,28 +215,46 @@ class ImageClassifier:
             print(f"[ERROR] Classification failed: {e}")
             return [NO_FACE_LABEL]
 
-    def _extract_features(self, img: np.ndarray) -> Optional[np.ndarray]:
+    def classify_landmarks(self, landmarks) -> List[str]:
+        """
+        Classify many faces (or frames) from stacked landmarks in one call
+        landmarks: (N, 68, 2) array of landmark coordinates
+        """
+        if self.model is None or len(landmarks) == 0:
+            return [NO_FACE_LABEL] * len(landmarks)
+
+        try:
+            features_scaled = self.scaler.transform(geometry_features(np.asarray(landmarks).reshape(-1, 68, 2)))
+            return [self.emotion_labels.get(prediction, 'neutral') for prediction in self.model.predict(features_scaled)]
+
+        except Exception as e:
+            print(f"[ERROR] Classification failed: {e}")
+            return [NO_FACE_LABEL] * len(landmarks)
+
+    def _extract_features(self, img) -> Optional[np.ndarray]:
         """Extract facial features for classification"""
         try:
-            if self.land_marker is None or not DLIB_AVAILABLE:
+            if self.land_marker is None or self.land_marker.detector is None:
                 # Fallback to basic features when dlib is not available
                 return self._extract_basic_features(img)
 
             # Get face rectangles
             faces = self.land_marker.get_face_rectangles(img)
+            if isinstance(img, FrameContext):
+                img = img.equalized
 
             if len(faces) == 0:
                 return None
 
             # Use the largest face
-            if DLIB_AVAILABLE and hasattr(faces[0], 'width'):
+            if hasattr(faces[0], 'width'):
                 # dlib rectangle objects
                 face_rect = max(faces, key=lambda rect: rect.width() * rect.height())
             else:
                 # OpenCV rectangles (x, y, w, h)
                 face_rect = max(faces, key=lambda rect: rect[2] * rect[3])
                 # Convert to dlib-like rectangle for compatibility
-                if not DLIB_AVAILABLE:
+                if self.land_marker.detector is None:
                     face_rect = type('MockRect', (), {
                         'left': lambda: face_rect[0],
                         'top': lambda: face_rect[1],
@@ -217,40 +268,21 @@ class ImageClassifier:
             if landmarks is None or len(landmarks) < 68:
                 return self._extract_basic_features(img)
 
-            # Extract geometric features from landmarks
-            features = []
-
-            # Distance features between key points
-            key_points = [17, 21, 22, 26, 36, 39, 42, 45, 48, 54, 57]  # Jaw, eyes, nose, mouth
-
-            for i in range(len(key_points)):
-                for j in range(i + 1, len(key_points)):
-                    p1 = landmarks[key_points[i]]
-                    p2 = landmarks[key_points[j]]
-                    dist = np.linalg.norm(p1 - p2)
-                    features.append(dist)
-
-            # Angle features
-            # Eye aspect ratios, mouth aspect ratio, etc.
-            left_eye = landmarks[36:42]
-            right_eye = landmarks[42:48]
-            mouth = landmarks[48:68]
-
-            features.extend(self._calculate_eye_features(left_eye))
-            features.extend(self._calculate_eye_features(right_eye))
-            features.extend(self._calculate_mouth_features(mouth))
-
-            return np.array(features)
+            # Pairwise distances and eye/mouth ratios in one vectorised call
+            return geometry_features(landmarks)
 
         except Exception as e:
             print(f"[ERROR] Feature extraction failed: {e}")
             return None
 
-    def _extract_basic_features(self, img: np.ndarray) -> Optional[np.ndarray]:
+    def _extract_basic_features(self, img) -> Optional[np.ndarray]:
         """Extract basic features when landmarks are not available"""
         try:
-            # Resize image
-            resized = cv2.resize(img, (48, 48))
+            # Resize image (reusing the context's resized copy when available)
+            if isinstance(img, FrameContext):
+                resized = img.resized((48, 48), equalized=True)
+            else:
+                resized = cv2.resize(img, (48, 48))
 
             # Flatten and normalize
             features = resized.flatten().astype(float) / 255.0
@@ -261,73 +293,6 @@ class ImageClassifier:
             print(f"[ERROR] Basic feature extraction failed: {e}")
             return None
 
-    def _calculate_eye_features(self, eye_points: np.ndarray) -> List[float]:
-        """Calculate eye aspect ratio and other eye features"""
-        features = []
-
-        if len(eye_points) >= 6:
-            # Eye aspect ratio (EAR)
-            ear = self._eye_aspect_ratio(eye_points)
-            features.append(ear)
-
-            # Eye width/height ratio
-            width = np.linalg.norm(eye_points[0] - eye_points[3])
-            height = np.linalg.norm(eye_points[1] - eye_points[5])
-            if height > 0:
-                features.append(width / height)
-            else:
-                features.append(0)
-
-        return features
-
-    def _calculate_mouth_features(self, mouth_points: np.ndarray) -> List[float]:
-        """Calculate mouth aspect ratio and smile features"""
-        features = []
-
-        if len(mouth_points) >= 12:
-            # Mouth aspect ratio (MAR)
-            mar = self._mouth_aspect_ratio(mouth_points)
-            features.append(mar)
-
-            # Smile detection (corner distances)
-            left_corner = mouth_points[0]
-            right_corner = mouth_points[6]
-            top_lip = mouth_points[3]
-            bottom_lip = mouth_points[9]
-
-            smile_ratio = np.linalg.norm(left_corner - right_corner) / (np.linalg.norm(top_lip - bottom_lip) + 0.001)
-            features.append(smile_ratio)
-
-        return features
-
-    def _eye_aspect_ratio(self, eye: np.ndarray) -> float:
-        """Calculate eye aspect ratio"""
-        if len(eye) < 6:
-            return 0.0
-
-        # Vertical distances
-        v1 = np.linalg.norm(eye[1] - eye[5])
-        v2 = np.linalg.norm(eye[2] - eye[4])
-
-        # Horizontal distance
-        h = np.linalg.norm(eye[0] - eye[3])
-
-        return (v1 + v2) / (2.0 * h) if h > 0 else 0.0
-
-    def _mouth_aspect_ratio(self, mouth: np.ndarray) -> float:
-        """Calculate mouth aspect ratio"""
-        if len(mouth) < 12:
-            return 0.0
-
-        # Vertical distances
-        v1 = np.linalg.norm(mouth[2] - mouth[10])
-        v2 = np.linalg.norm(mouth[4] - mouth[8])
-
-        # Horizontal distance
-        h = np.linalg.norm(mouth[0] - mouth[6])
-
-        return (v1 + v2) / (2.0 * h) if h > 0 else 0.0
-
     def extract_face_rectangle(self, img: np.ndarray) -> List[Tuple[int, int, int, int]]:
         """Extract face rectangles for visualization"""
         if self.land_marker is None:
@@ -353,11 +318,24 @@ class ImageClassifier:
 class EmotionDetector:
     """Modern emotion detector using DeepFace library"""
 
+    # FER works on the colour face ROI, so frames must be decoded in colour
+    gray_input = False
+
     def __init__(self):
         """Initialize the emotion detector with DeepFace"""
-        self.deepface_available = DEEPFACE_AVAILABLE
+        # Only checks that DeepFace is installed; importing it pulls in TensorFlow
+        self.deepface_available = module_available('deepface')
+
+        # Optional detection tiers; both stay disabled until a model is configured
+        self.fer_detector = None
+        self.classifier = None
+        self.CLAHE = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
 
-        if DEEPFACE_AVAILABLE:
+        # Face feature extractor for the rule-based fallback: 'integral'
+        # (O(1) regional stats) or 'legacy' (_extract_enhanced_features)
+        self.feature_extractor = os.getenv('FACE_FEATURES', 'integral').lower()
+
+        if self.deepface_available:
             print("✅ DeepFace emotion detector ready")
         else:
             print("⚠️  DeepFace not available - using basic OpenCV detection")
@@ -379,37 +357,49 @@ class EmotionDetector:
             NO_FACE_LABEL: 'neutral'
         }
 
-    def detect_emotion(self, frame):
+    def detect_emotion(self, frame, tracker=None):
         """
         Advanced emotion detection using FER library (primary) with fallbacks
         Based on Streamlit approach for improved accuracy
+        frame may be a raw frame or a FrameContext shared with other stages;
+        tracker is an optional per-session FaceTracker that narrows the face search
         Returns: (emotion, confidence)
         """
+        emotion, confidence, _ = self._detect(frame, tracker)
+        return emotion, confidence
+
+    def _detect(self, frame, tracker=None):
+        """detect_emotion() plus the (x, y, w, h) face box it used, or None"""
         try:
+            ctx = as_frame_context(frame, self.CLAHE)
+
             # Check for black screen/camera issues (from Streamlit code)
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            avg_brightness = np.mean(gray)
+            gray = ctx.gray
+            avg_brightness = ctx.brightness
             brightness_threshold = 20  # A value close to 0 indicates a very dark image
 
             if avg_brightness < brightness_threshold:
                 print("⚠️  Camera feed appears black or obstructed")
-                return 'neutral', 0.1
+                return 'neutral', 0.1, None
 
             # Priority 1: Use FER library (most accurate)
             if self.fer_detector is not None:
                 try:
                     # Detect faces using OpenCV first
-                    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-                    faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
+                    def find_faces(image):
+                        return detect_faces(image, scale_factor=1.1, min_neighbors=5, min_size=(30, 30))
+
+                    faces = tracker.detect(gray, find_faces) if tracker is not None else find_faces(gray)
 
                     if len(faces) == 0:
-                        return 'neutral', 0.0
+                        return 'neutral', 0.0, None
 
                     # Use the largest face detected
-                    x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+                    box = max(faces, key=lambda f: f[2] * f[3])
+                    x, y, w, h = box
 
                     # Get the region of interest (ROI) for emotion detection
-                    roi = frame[y:y + h, x:x + w]
+                    roi = ctx.frame[y:y + h, x:x + w]
 
                     # Ensure the ROI is valid before performing emotion detection
                     if roi is not None and roi.size > 0:
@@ -421,59 +411,77 @@ class EmotionDetector:
                             emotion, score = emotions
                             # Map to our emotion categories and boost confidence
                             mapped_emotion = self.emotion_mapping.get(emotion, 'neutral')
-                            return mapped_emotion, min(score + 0.2, 0.95)
+                            return mapped_emotion, min(score + 0.2, 0.95), box
                         else:
                             # Handle case when no valid emotion is detected
-                            return 'neutral', 0.0
+                            return 'neutral', 0.0, box
                     else:
-                        return 'neutral', 0.0
+                        return 'neutral', 0.0, box
 
                 except Exception as e:
                     print(f"FER detection error: {e}")
                     # Fall back to enhanced detection
-                    return self._fallback_detection(gray)
+                    return self._fallback_detection(ctx, tracker)
 
             # Priority 2: Use ML classifier
             elif self.classifier is not None:
                 try:
-                    # Apply CLAHE for better image quality
-                    processed_frame = self.CLAHE.apply(gray)
-                    emotions = self.classifier.classify(processed_frame)
+                    # Classifier works on the context's CLAHE-equalised image
+                    emotions = self.classifier.classify(ctx)
 
                     if emotions and emotions[0] != NO_FACE_LABEL:
                         emotion = emotions[0]
                         mapped_emotion = self.emotion_mapping.get(emotion, 'neutral')
-                        return mapped_emotion, 0.85
+                        return mapped_emotion, 0.85, None
                     else:
-                        return self._fallback_detection(gray)
+                        return self._fallback_detection(ctx, tracker)
                 except Exception as e:
                     print(f"ML classifier error: {e}")
-                    return self._fallback_detection(gray)
+                    return self._fallback_detection(ctx, tracker)
 
             # Priority 3: Enhanced rule-based detection
             else:
-                return self._fallback_detection(gray)
+                return self._fallback_detection(ctx, tracker)
 
         except Exception as e:
             print(f"Error in emotion detection: {str(e)}")
-            return 'neutral', 0.0
+            return 'neutral', 0.0, None
 
-    def _fallback_detection(self, gray_frame):
-        """Enhanced rule-based emotion detection as fallback"""
+    def analyze(self, frame, scale=1, tracker=None):
+        """
+        detect_emotion() with the detector backend contract
+        face is the box the detection used, or None when no face was found
+        (or the ML classifier decided, which does not report one)
+        Returns: (emotion, confidence, face)
+        """
+        emotion, confidence, box = self._detect(frame, tracker)
+        return emotion, confidence, scale_box(box, scale) if box is not None else None
+
+    def _fallback_detection(self, frame, tracker=None):
+        """Enhanced rule-based emotion detection as fallback; returns (emotion, confidence, box)"""
         try:
+            ctx = as_frame_context(frame, self.CLAHE)
+            gray_frame = ctx.gray
+
             # Detect faces using OpenCV
-            face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-            faces = face_cascade.detectMultiScale(gray_frame, 1.1, 5, minSize=(50, 50))
+            def find_faces(image):
+                return detect_faces(image, 1.1, 5, min_size=(50, 50))
+
+            faces = tracker.detect(gray_frame, find_faces) if tracker is not None else find_faces(gray_frame)
 
             if len(faces) == 0:
-                return 'neutral', 0.0
+                return 'neutral', 0.0, None
 
             # Use largest face
-            x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
-            face_roi = gray_frame[y:y+h, x:x+w]
+            box = max(faces, key=lambda f: f[2] * f[3])
+            x, y, w, h = box
 
             # Enhanced feature analysis
-            features = self._extract_enhanced_features(face_roi, gray_frame, (x, y, w, h))
+            if self.feature_extractor == 'legacy':
+                face_roi = gray_frame[y:y+h, x:x+w]
+                features = self._extract_enhanced_features(face_roi, gray_frame, (x, y, w, h))
+            else:
+                features = features_to_dicts(integral_feature_matrix(ctx, [(x, y, w, h)]))[0]
 
             # Multi-factor emotion classification
             scores = self._calculate_emotion_scores_enhanced(features)
@@ -481,11 +489,53 @@ class EmotionDetector:
 
             confidence = min(best_emotion[1] + 0.2, 0.9)
 
-            return best_emotion[0], confidence
+            return best_emotion[0], confidence, box
 
         except Exception as e:
             print(f"Fallback detection error: {e}")
-            return 'neutral', 0.0
+            return 'neutral', 0.0, None
+
+    def analyze_faces(self, frame, scale=1):
+        """
+        Rule-based emotion detection for every face in the frame
+        Features for all faces come from one integral image and are scored
+        in a single vectorised call (see emotion_rules.score_emotions)
+        Returns: (emotion, confidence, face, faces) where the first three
+        describe the largest face and faces is a list of
+        {'box', 'emotion', 'confidence'}, largest face first
+        """
+        try:
+            ctx = as_frame_context(frame, self.CLAHE)
+
+            brightness_threshold = 20
+            if ctx.brightness < brightness_threshold:
+                return 'neutral', 0.1, None, []
+
+            min_face = min_face_size(scale)
+            faces = detect_faces(ctx.gray, 1.1, 5, min_size=min_face)
+
+            if len(faces) == 0:
+                return 'neutral', 0.0, None, []
+
+            faces = sorted((tuple(f) for f in faces), key=lambda f: f[2] * f[3], reverse=True)
+            features = integral_feature_matrix(ctx, faces)
+            scores = score_emotions(features[:, :len(FEATURES)])
+
+            best = scores.argmax(axis=1)
+            confidences = np.minimum(scores[np.arange(len(faces)), best] + 0.2, 0.9)
+
+            results = [{
+                'box': scale_box(box, scale),
+                'emotion': EMOTIONS[index],
+                'confidence': float(confidence)
+            } for box, index, confidence in zip(faces, best, confidences)]
+
+            largest = results[0]
+            return largest['emotion'], largest['confidence'], largest['box'], results
+
+        except Exception as e:
+            print(f"Multi-face detection error: {e}")
+            return 'neutral', 0.0, None, []
 
     def _extract_enhanced_features(self, face_img, gray_frame=None, face_coords=None):
         """Extract comprehensive facial features for emotion analysis"""
@@ -516,66 +566,15 @@ class EmotionDetector:
 
     def _calculate_emotion_scores_enhanced(self, features):
         """Enhanced emotion scoring based on multiple features"""
-        scores = {
-            'happy': 0.0, 'sad': 0.0, 'stressed': 0.0,
-            'neutral': 0.0, 'excited': 0.0, 'calm': 0.0,
-            'focused': 0.0, 'tired': 0.0
-        }
-
-        brightness = features['brightness']
-        contrast = features['contrast']
-        symmetry = features['symmetry']
-
-        # Brightness-based scoring
-        if brightness > 150:
-            scores['happy'] += 0.4
-            scores['excited'] += 0.3
-        elif brightness < 100:
-            scores['sad'] += 0.4
-            scores['tired'] += 0.2
-        elif brightness < 120:
-            scores['stressed'] += 0.3
-            scores['focused'] += 0.2
-
-        # Contrast-based scoring
-        if contrast > 0.7:
-            scores['excited'] += 0.3
-            scores['focused'] += 0.2
-        elif contrast < 0.4:
-            scores['calm'] += 0.3
-            scores['tired'] += 0.2
-
-        # Symmetry-based scoring
-        if symmetry > 0.8:
-            scores['calm'] += 0.3
-            scores['neutral'] += 0.2
-        elif symmetry < 0.6:
-            scores['stressed'] += 0.3
-            scores['excited'] += 0.2
-
-        # Regional analysis
-        eye_brightness = features.get('eye_region', brightness)
-        mouth_brightness = features.get('mouth_region', brightness)
+        scores = score_emotions(feature_matrix([features]))[0]
+        return {emotion: float(score) for emotion, score in zip(EMOTIONS, scores)}
 
-        if eye_brightness > brightness + 15:
-            scores['excited'] += 0.2
-            scores['focused'] += 0.3
-        elif eye_brightness < brightness - 10:
-            scores['tired'] += 0.3
-
-        if mouth_brightness > brightness + 20:
-            scores['happy'] += 0.5
-            scores['excited'] += 0.3
-        elif mouth_brightness < brightness - 15:
-            scores['sad'] += 0.4
-
-        # Normalize scores
-        total = sum(scores.values())
-        if total > 0:
-            for emotion in scores:
-                scores[emotion] = scores[emotion] / total
-
-        return scores
+    def score_faces(self, features_list):
+        """
+        Score many faces in one vectorised call
+        Returns: (N, 8) score matrix with columns emotion_rules.EMOTIONS
+        """
+        return score_emotions(feature_matrix(features_list))
 
     def get_face_with_emotion(self, frame):
         """
@@ -584,8 +583,10 @@ class EmotionDetector:
         """
         try:
             # Check for black screen first
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            avg_brightness = np.mean(gray)
+            ctx = as_frame_context(frame, self.CLAHE)
+            frame = ctx.frame
+            gray = ctx.gray
+            avg_brightness = ctx.brightness
             brightness_threshold = 20
 
             if avg_brightness < brightness_threshold:
@@ -597,8 +598,7 @@ class EmotionDetector:
             if self.fer_detector is not None:
                 try:
                     # Detect faces using OpenCV
-                    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-                    faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
+                    faces = detect_faces(gray, scale_factor=1.1, min_neighbors=5, min_size=(30, 30))
 
                     # For each face detected, perform emotion detection
                     for (x, y, w, h) in faces:
@@ -633,8 +633,8 @@ class EmotionDetector:
                 except Exception as e:
                     print(f"FER visualization error: {e}")
                     # Fall back to basic visualization
-                    emotion, confidence = self._fallback_detection(gray)
-                    faces = face_cascade.detectMultiScale(gray, 1.1, 5, minSize=(50, 50))
+                    emotion, confidence, _ = self._fallback_detection(ctx)
+                    faces = detect_faces(gray, 1.1, 5, min_size=(50, 50))
 
                     for (x, y, w, h) in faces:
                         cv2.rectangle(frame, (x, y), (x+w, y+h), BLUE_COLOR, 2)
@@ -643,9 +643,8 @@ class EmotionDetector:
 
             else:
                 # Fallback to basic visualization
-                emotion, confidence = self._fallback_detection(gray)
-                face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-                faces = face_cascade.detectMultiScale(gray, 1.1, 5, minSize=(50, 50))
+                emotion, confidence, _ = self._fallback_detection(ctx)
+                faces = detect_faces(gray, 1.1, 5, min_size=(50, 50))
 
                 for (x, y, w, h) in faces:
                     cv2.rectangle(frame, (x, y), (x+w, y+h), BLUE_COLOR, 2)
@@ -0,0 +1,87 @@
+import numpy as np
+
+# Score columns, in the order the rule-based detector has always used
+EMOTIONS = ('happy', 'sad', 'stressed', 'neutral', 'excited', 'calm', 'focused', 'tired')
+
+# Feature matrix columns (see feature_matrix)
+FEATURES = ('brightness', 'contrast', 'symmetry', 'eye_region', 'mouth_region')
+BRIGHTNESS, CONTRAST, SYMMETRY, EYE_REGION, MOUTH_REGION = range(len(FEATURES))
+
+_INF = np.inf
+
+# One row per rule: input column, lower bound, lower bound inclusive,
+# upper bound (always exclusive), and whether the bounds are offsets from
+# the face brightness. if/elif chains become disjoint intervals.
+RULE_INPUTS = np.array([
+    BRIGHTNESS, BRIGHTNESS, BRIGHTNESS,
+    CONTRAST, CONTRAST,
+    SYMMETRY, SYMMETRY,
+    EYE_REGION, EYE_REGION,
+    MOUTH_REGION, MOUTH_REGION,
+])
+RULE_LOWER = np.array([150, -_INF, 100, 0.7, -_INF, 0.8, -_INF, 15, -_INF, 20, -_INF], dtype=float)
+RULE_LOWER_INCLUSIVE = np.array([False, False, True, False, False, False, False, False, False, False, False])
+RULE_UPPER = np.array([_INF, 100, 120, _INF, 0.4, _INF, 0.6, _INF, -10, _INF, -15], dtype=float)
+RULE_RELATIVE = np.array([False, False, False, False, False, False, False, True, True, True, True])
+
+# Score added to each emotion (columns follow EMOTIONS) when a rule fires
+RULE_WEIGHTS = np.array([
+    # happy sad  stress neutral excited calm focused tired
+    [0.4, 0.0, 0.0, 0.0, 0.3, 0.0, 0.0, 0.0],  # bright face
+    [0.0, 0.4, 0.0, 0.0, 0.0, 0.0, 0.0, 0.2],  # dark face
+    [0.0, 0.0, 0.3, 0.0, 0.0, 0.0, 0.2, 0.0],  # dim face
+    [0.0, 0.0, 0.0, 0.0, 0.3, 0.0, 0.2, 0.0],  # high contrast
+    [0.0, 0.0, 0.0, 0.0, 0.0, 0.3, 0.0, 0.2],  # low contrast
+    [0.0, 0.0, 0.0, 0.2, 0.0, 0.3, 0.0, 0.0],  # symmetric
+    [0.0, 0.0, 0.3, 0.0, 0.2, 0.0, 0.0, 0.0],  # asymmetric
+    [0.0, 0.0, 0.0, 0.0, 0.2, 0.0, 0.3, 0.0],  # bright eyes
+    [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.3],  # dark eyes
+    [0.5, 0.0, 0.0, 0.0, 0.3, 0.0, 0.0, 0.0],  # bright mouth
+    [0.0, 0.4, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],  # dark mouth
+])
+
+
+def feature_matrix(features_list) -> np.ndarray:
+    """
+    Stack feature dicts into an (N, F) matrix with columns FEATURES
+    Missing regional features default to the face brightness
+    """
+    rows = []
+    for features in features_list:
+        brightness = features['brightness']
+        rows.append((
+            brightness,
+            features['contrast'],
+            features['symmetry'],
+            features.get('eye_region', brightness),
+            features.get('mouth_region', brightness),
+        ))
+    return np.array(rows, dtype=float).reshape(-1, len(FEATURES))
+
+
+def score_emotions(X: np.ndarray) -> np.ndarray:
+    """
+    Score every face against the rule table in one vectorised pass
+    Args:
+        X (np.ndarray): (N, F) feature matrix with columns FEATURES
+    Returns:
+        np.ndarray: (N, 8) normalised scores with columns EMOTIONS
+    """
+    X = np.asarray(X, dtype=float).reshape(-1, len(FEATURES))
+
+    values = X[:, RULE_INPUTS]
+    offset = np.where(RULE_RELATIVE, X[:, BRIGHTNESS, None], 0.0)
+    lower = RULE_LOWER + offset
+    upper = RULE_UPPER + offset
+
+    above = np.where(RULE_LOWER_INCLUSIVE, values >= lower, values > lower)
+    fired = above & (values < upper)
+
+    # Accumulate rule by rule (vectorised over faces) so sums match the
+    # original if-chain exactly, ties included
+    scores = np.zeros((X.shape[0], len(EMOTIONS)))
+    for rule in range(len(RULE_WEIGHTS)):
+        scores += fired[:, rule, None] * RULE_WEIGHTS[rule]
+
+    totals = scores.sum(axis=1, keepdims=True)
+    return np.divide(scores, totals, out=scores, where=totals > 0)
@@ -0,0 +1,86 @@
+import os
+import threading
+import numpy as np
+from emotion_rules import EMOTIONS
+
+_EMOTION_INDEX = {emotion: i for i, emotion in enumerate(EMOTIONS)}
+
+
+class EmotionSmoother:
+    """
+    Per-session temporal smoothing of raw per-frame emotions
+    Each session keeps its last `window` frames as per-emotion score
+    vectors in a fixed-size ring buffer. Scores are averaged with
+    exponentially decaying weights (an EMA limited to the window), and the
+    stable emotion only changes when another emotion beats it by `margin`
+    (hysteresis), so single-frame flips do not reach the client.
+    """
+
+    def __init__(self, window=None, alpha=None, margin=None):
+        """
+        Args:
+            window (int): Frames kept per session
+            alpha (float): EMA weight of the newest frame (0-1)
+            margin (float): Score lead another emotion needs to replace the stable one
+        """
+        self.window = window if window is not None else int(os.getenv('EMOTION_SMOOTHING_WINDOW', 8))
+        self.alpha = alpha if alpha is not None else float(os.getenv('EMOTION_SMOOTHING_ALPHA', 0.4))
+        self.margin = margin if margin is not None else float(os.getenv('EMOTION_SMOOTHING_MARGIN', 0.15))
+
+        # Weight of a frame by age (0 = newest)
+        self.weights = (1.0 - self.alpha) ** np.arange(self.window)
+
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def update(self, session_id, emotion, confidence):
+        """
+        Add a raw frame result to the session's stream
+        Returns: dict with stable_emotion, stable_confidence and
+        stable_changed (True when the stable emotion switched on this frame)
+        """
+        scores = np.zeros(len(EMOTIONS))
+        scores[_EMOTION_INDEX.get(emotion, _EMOTION_INDEX['neutral'])] = confidence
+
+        with self.lock:
+            state = self.sessions.get(session_id)
+            if state is None:
+                state = self.sessions[session_id] = {
+                    'buffer': np.zeros((self.window, len(EMOTIONS))),
+                    'next': 0,
+                    'count': 0,
+                    'stable': None
+                }
+
+            # Ring buffer write
+            buffer = state['buffer']
+            buffer[state['next']] = scores
+            state['next'] = (state['next'] + 1) % self.window
+            state['count'] = min(state['count'] + 1, self.window)
+
+            smoothed = self._smoothed(state)
+            leader = int(smoothed.argmax())
+
+            stable = state['stable']
+            changed = stable is None or (leader != stable and smoothed[leader] >= smoothed[stable] + self.margin)
+            if changed:
+                state['stable'] = stable = leader
+
+            return {
+                'stable_emotion': EMOTIONS[stable],
+                'stable_confidence': float(smoothed[stable]),
+                'stable_changed': changed
+            }
+
+    def _smoothed(self, state):
+        """Decay-weighted mean of the buffered frames, newest weighted highest"""
+        count = state['count']
+        # Row indices from newest to oldest
+        rows = (state['next'] - 1 - np.arange(count)) % self.window
+        weights = self.weights[:count]
+        return weights @ state['buffer'][rows] / weights.sum()
+
+    def forget(self, session_id):
+        """Drop smoothing state for a disconnected session"""
+        with self.lock:
+            self.sessions.pop(session_id, None)
@@ -0,0 +1,46 @@
+import os
+import threading
+import cv2
+
+FRONTAL_FACE_CASCADE = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+
+# Smallest face (in original frame pixels) looked for by the realtime detectors
+MIN_FACE_SIZE = int(os.getenv('MIN_FACE_SIZE', 50))
+
+# CascadeClassifier is not safe to share between threads, so each thread
+# keeps its own instance; the XML is parsed once per thread, not per frame
+_local = threading.local()
+
+
+def get_face_cascade(cascade_path: str = FRONTAL_FACE_CASCADE):
+    """Return this thread's cached CascadeClassifier, loading it on first use"""
+    cascades = getattr(_local, 'cascades', None)
+    if cascades is None:
+        cascades = _local.cascades = {}
+
+    cascade = cascades.get(cascade_path)
+    if cascade is None:
+        cascade = cv2.CascadeClassifier(cascade_path)
+        if cascade.empty():
+            raise IOError(f"Failed to load face cascade from {cascade_path}")
+        cascades[cascade_path] = cascade
+
+    return cascade
+
+
+def detect_faces(gray, scale_factor=1.1, min_neighbors=5, min_size=(50, 50)):
+    """
+    Run Haar face detection on a grayscale image
+    Returns: array of (x, y, w, h) boxes
+    """
+    return get_face_cascade().detectMultiScale(gray, scale_factor, min_neighbors, minSize=min_size)
+
+
+def min_face_size(scale=1):
+    """
+    Minimum face box for a frame downscaled by scale, so the limit stays
+    MIN_FACE_SIZE pixels of the original frame
+    Returns: (w, h) tuple for detect_faces(min_size=...)
+    """
+    size = max(round(MIN_FACE_SIZE / scale), 1)
+    return (size, size)
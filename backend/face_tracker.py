@@ -0,0 +1,72 @@
+import os
+
+
+class FaceTracker:
+    """
+    Per-session face tracking between frames
+    Once a face is found, later frames are searched only in a padded
+    region around the last box. The whole frame is scanned again on a
+    miss or every redetect_every frames.
+    """
+
+    def __init__(self, redetect_every=None, padding=0.5):
+        """
+        Args:
+            redetect_every (int): Force a full-frame detection after this many tracked frames
+            padding (float): Search margin around the last box, as a fraction of its size
+        """
+        self.redetect_every = redetect_every if redetect_every is not None else int(os.getenv('FACE_REDETECT_INTERVAL', 10))
+        self.padding = padding
+        self.last_box = None
+        self.frames_since_full = 0
+        self.tracked_frames = 0
+        self.full_detections = 0
+        # Previous frame's emotion, for detectors that react to changes
+        self.last_emotion = None
+
+    def detect(self, gray, detect_faces):
+        """
+        Find faces in a grayscale frame
+        Args:
+            gray (np.ndarray): Grayscale frame
+            detect_faces (callable): Runs face detection on a grayscale image
+                and returns (x, y, w, h) boxes
+        Returns:
+            list: Face boxes in frame coordinates
+        """
+        if self.last_box is not None and self.frames_since_full < self.redetect_every:
+            x0, y0, x1, y1 = self._search_region(gray.shape)
+            faces = detect_faces(gray[y0:y1, x0:x1])
+
+            if len(faces) > 0:
+                faces = [(x + x0, y + y0, w, h) for (x, y, w, h) in faces]
+                self.last_box = max(faces, key=lambda f: f[2] * f[3])
+                self.frames_since_full += 1
+                self.tracked_frames += 1
+                return faces
+
+        # Miss or periodic refresh: scan the whole frame
+        faces = [tuple(f) for f in detect_faces(gray)]
+        self.last_box = max(faces, key=lambda f: f[2] * f[3]) if faces else None
+        self.frames_since_full = 0
+        self.full_detections += 1
+        return faces
+
+    def get_stats(self):
+        """Frames served from the tracked region vs full-frame scans"""
+        return {'tracked_frames': self.tracked_frames, 'full_detections': self.full_detections}
+
+    def reset(self):
+        """Forget the tracked face so the next frame is fully scanned"""
+        self.last_box = None
+        self.frames_since_full = 0
+        self.last_emotion = None
+
+    def _search_region(self, shape):
+        """Padded region around the last box, clipped to the frame"""
+        x, y, w, h = self.last_box
+        pad_x = int(w * self.padding)
+        pad_y = int(h * self.padding)
+        height, width = shape[:2]
+        return (max(x - pad_x, 0), max(y - pad_y, 0),
+                min(x + w + pad_x, width), min(y + h + pad_y, height))
@@ -0,0 +1,71 @@
+from functools import cached_property
+import cv2
+import numpy as np
+
+
+class FrameContext:
+    """
+    Preprocessed views of a single frame
+    Every derived image (grayscale, CLAHE-equalised, integral images,
+    resized copies) is computed on first access and reused by the
+    brightness check, face detection and feature extraction.
+    """
+
+    def __init__(self, frame: np.ndarray, clahe=None):
+        """
+        Args:
+            frame (np.ndarray): BGR or grayscale frame
+            clahe: cv2.CLAHE instance used for the equalised image
+        """
+        self.frame = frame
+        self.clahe = clahe
+        self._resized = {}
+
+    @cached_property
+    def gray(self) -> np.ndarray:
+        """Grayscale frame (no copy when the frame is already gray)"""
+        if self.frame.ndim == 2:
+            return self.frame
+        return cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY)
+
+    @cached_property
+    def brightness_stats(self):
+        """(mean, std) of the grayscale frame from a single pass"""
+        mean, std = cv2.meanStdDev(self.gray)
+        return float(mean[0][0]), float(std[0][0])
+
+    @property
+    def brightness(self) -> float:
+        return self.brightness_stats[0]
+
+    @property
+    def contrast(self) -> float:
+        mean, std = self.brightness_stats
+        return std / (mean + 1e-7)
+
+    @cached_property
+    def equalized(self) -> np.ndarray:
+        """CLAHE-equalised grayscale frame"""
+        if self.clahe is None:
+            self.clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        return self.clahe.apply(self.gray)
+
+    @cached_property
+    def integral(self):
+        """(sum, squared sum) integral images of the grayscale frame"""
+        return cv2.integral2(self.gray, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+
+    def resized(self, size, equalized: bool = False) -> np.ndarray:
+        """Grayscale (or equalised) frame resized to size=(width, height)"""
+        key = (tuple(size), equalized)
+        if key not in self._resized:
+            source = self.equalized if equalized else self.gray
+            self._resized[key] = cv2.resize(source, tuple(size))
+        return self._resized[key]
+
+
+def as_frame_context(frame, clahe=None) -> FrameContext:
+    """Wrap a raw frame in a FrameContext, passing existing contexts through"""
+    if isinstance(frame, FrameContext):
+        return frame
+    return FrameContext(frame, clahe)
@@ -0,0 +1,85 @@
+import base64
+import os
+import cv2
+import numpy as np
+
+# Ingest modes: (imdecode flag, downscale factor)
+DECODE_MODES = {
+    'color': (cv2.IMREAD_COLOR, 1),
+    'gray': (cv2.IMREAD_GRAYSCALE, 1),
+    'gray2': (cv2.IMREAD_REDUCED_GRAYSCALE_2, 2),
+    'gray4': (cv2.IMREAD_REDUCED_GRAYSCALE_4, 4),
+    'gray8': (cv2.IMREAD_REDUCED_GRAYSCALE_8, 8),
+}
+
+# Configured ingest mode, e.g. FRAME_DECODE_MODE=gray2
+DEFAULT_DECODE_MODE = os.getenv('FRAME_DECODE_MODE', 'color').lower()
+
+
+def frame_buffer(payload):
+    """
+    Return a uint8 view over the encoded image carried by payload
+    Accepts either:
+    1. Raw JPEG/PNG bytes (Socket.IO binary attachment or octet-stream body)
+    2. Base64 data URL string from older clients
+    Returns None when the payload carries no usable image
+    """
+    if isinstance(payload, str):
+        # Legacy clients send data:image/jpeg;base64,...
+        if payload.startswith('data:'):
+            if ',' not in payload:
+                return None
+            encoded = payload.split(',', 1)[1]
+        else:
+            encoded = payload
+        try:
+            payload = base64.b64decode(encoded)
+        except (ValueError, TypeError):
+            return None
+
+    if not isinstance(payload, (bytes, bytearray, memoryview)):
+        return None
+
+    # np.frombuffer wraps the existing buffer without copying it
+    buffer = np.frombuffer(payload, np.uint8)
+    return buffer if buffer.size > 0 else None
+
+
+def decode_frame(payload, flags=cv2.IMREAD_COLOR):
+    """
+    Decode an image payload into an OpenCV frame
+    Returns None if the payload cannot be decoded
+    """
+    buffer = frame_buffer(payload)
+    if buffer is None:
+        return None
+
+    return cv2.imdecode(buffer, flags)
+
+
+def decode_frame_for(payload, detector, mode=None):
+    """
+    Decode a frame in the cheapest form the detector can use
+    Detectors that set gray_input = True get a (possibly downscaled)
+    grayscale image straight from the decoder; everyone else gets colour.
+    Returns: (frame, scale) where scale maps frame pixels back to the
+    original image size
+    """
+    mode = (mode or DEFAULT_DECODE_MODE).lower()
+    if mode not in DECODE_MODES:
+        print(f"⚠️  Unknown FRAME_DECODE_MODE '{mode}', using colour decode")
+        mode = 'color'
+
+    if not getattr(detector, 'gray_input', False):
+        mode = 'color'
+
+    flags, scale = DECODE_MODES[mode]
+    return decode_frame(payload, flags), scale
+
+
+def scale_box(box, scale):
+    """Map an (x, y, w, h) box from a reduced frame back to original coordinates"""
+    if box is None:
+        return None
+
+    return tuple(int(v * scale) for v in box)
@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+import cv2
+import numpy as np
+
+
+def frame_hash(frame, hash_size=8):
+    """Difference hash of the frame as a packed bit array"""
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    return np.packbits(small[:, 1:] > small[:, :-1])
+
+
+def hash_distance(hash_a, hash_b):
+    """Number of differing bits between two frame hashes"""
+    return int(np.unpackbits(hash_a ^ hash_b).sum())
+
+
+def is_duplicate(reference_hash, new_hash, threshold):
+    """Whether a frame hash is close enough to the reference to reuse its result"""
+    return reference_hash is not None and hash_distance(reference_hash, new_hash) <= threshold
+
+
+class FrameSimilarityGate:
+    """
+    Per-session near-duplicate frame suppression
+    Each session remembers the perceptual hash of the last analysed frame
+    and its result; frames whose hash is within the threshold reuse it.
+    The comparison itself (is_duplicate) runs wherever the frame is decoded
+    (see detection_pool), so only hashes cross process boundaries.
+    """
+
+    def __init__(self, threshold=None, max_age=None):
+        """
+        Args:
+            threshold (int): Max differing hash bits for a frame to count as a duplicate
+            max_age (float): Seconds after which a cached result is recomputed anyway
+        """
+        self.threshold = threshold if threshold is not None else int(os.getenv('FRAME_SIMILARITY_THRESHOLD', 4))
+        self.max_age = max_age if max_age is not None else float(os.getenv('FRAME_CACHE_MAX_AGE', 10))
+
+        self.sessions = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def reference(self, session_id):
+        """Hash of the session's last analysed frame, or None if there is no fresh one"""
+        with self.lock:
+            entry = self.sessions.get(session_id)
+            if entry is None or time.time() - entry[2] >= self.max_age:
+                return None
+            return entry[0]
+
+    def cached(self, session_id):
+        """Return the session's cached result for a frame judged a duplicate"""
+        with self.lock:
+            entry = self.sessions.get(session_id)
+            if entry is None:
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def store(self, session_id, new_hash, result):
+        """Remember the result of a freshly analysed frame"""
+        with self.lock:
+            self.misses += 1
+            self.sessions[session_id] = (new_hash, result, time.time())
+
+    def forget(self, session_id):
+        """Drop cached state for a disconnected session"""
+        with self.lock:
+            self.sessions.pop(session_id, None)
+
+    def get_stats(self):
+        """Hit/miss counters for monitoring"""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'active_sessions': len(self.sessions),
+                'threshold': self.threshold
+            }
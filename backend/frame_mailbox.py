@@ -0,0 +1,87 @@
+import threading
+
+
+class LatestFrameMailbox:
+    """
+    Per-connection single-slot mailbox for real-time frames
+    Each session has at most one frame being analysed and one waiting.
+    A frame that arrives while another is waiting replaces it, so only the
+    freshest frame is analysed and latency stays bounded under load.
+    """
+
+    def __init__(self):
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def offer(self, session_id, payload):
+        """
+        Hand a new frame to the session's mailbox
+        Returns True if nothing is in flight and the caller should start
+        processing payload now; otherwise the frame waits in the slot
+        """
+        with self.lock:
+            state = self.sessions.get(session_id)
+            if state is None:
+                state = self.sessions[session_id] = {'busy': False, 'pending': None, 'dropped': 0, 'dropped_total': 0}
+
+            if not state['busy']:
+                state['busy'] = True
+                return True
+
+            if state['pending'] is not None:
+                # Stale waiting frame is replaced by the newer one
+                state['dropped'] += 1
+                state['dropped_total'] += 1
+            state['pending'] = payload
+            return False
+
+    def next(self, session_id):
+        """
+        Called when a frame finishes; returns the waiting frame to analyse
+        next, or None (and marks the session idle) if there is none
+        """
+        with self.lock:
+            state = self.sessions.get(session_id)
+            if state is None:
+                return None
+
+            payload = state['pending']
+            state['pending'] = None
+            if payload is None:
+                state['busy'] = False
+            return payload
+
+    def release(self, session_id):
+        """
+        Mark the session idle after processing failed, dropping any waiting
+        frame, so the next frame offered starts processing again
+        """
+        with self.lock:
+            state = self.sessions.get(session_id)
+            if state is None:
+                return
+
+            if state['pending'] is not None:
+                state['pending'] = None
+                state['dropped'] += 1
+                state['dropped_total'] += 1
+            state['busy'] = False
+
+    def take_dropped(self, session_id):
+        """
+        Dropped-frame counts for a result about to be sent
+        Returns: (dropped since the previous result, dropped over the session)
+        """
+        with self.lock:
+            state = self.sessions.get(session_id)
+            if state is None:
+                return 0, 0
+
+            dropped = state['dropped']
+            state['dropped'] = 0
+            return dropped, state['dropped_total']
+
+    def forget(self, session_id):
+        """Drop mailbox state for a disconnected session"""
+        with self.lock:
+            self.sessions.pop(session_id, None)
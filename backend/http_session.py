@@ -0,0 +1,69 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Seconds to establish a connection / to wait for response data
+CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05))
+READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 10))
+
+# Keep-alive connections kept per host
+POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 10))
+
+# Retries for connection errors and 429/5xx responses, with exponential backoff;
+# read timeouts are not retried so a hung upstream fails after one timeout
+RETRIES = int(os.getenv('HTTP_RETRIES', 2))
+RETRY_BACKOFF = float(os.getenv('HTTP_RETRY_BACKOFF', 0.3))
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies a default (connect, read) timeout to every call"""
+
+    def __init__(self, timeout=None):
+        super().__init__()
+        self.timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def create_session(pool_size=None, retries=None, backoff=None, timeout=None):
+    """
+    Build a pooled HTTP session
+    Connections are kept alive and reused per host (bounded by pool_size,
+    extra concurrent requests get short-lived connections rather than
+    blocking), failed connections and 429/5xx responses to idempotent
+    requests are retried with backoff, and every call has a timeout so a
+    hung upstream cannot block a worker forever.
+    """
+    pool_size = pool_size or POOL_SIZE
+    retry = Retry(
+        total=RETRIES if retries is None else retries,
+        read=False,
+        backoff_factor=RETRY_BACKOFF if backoff is None else backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = TimeoutSession(timeout)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_shared_session = None
+_lock = threading.Lock()
+
+
+def get_session():
+    """Process-wide pooled session shared by the API clients"""
+    global _shared_session
+    with _lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+        return _shared_session
@@ -0,0 +1,65 @@
+import numpy as np
+
+# 68-point landmark indices used by ImageClassifier
+KEY_POINTS = np.array([17, 21, 22, 26, 36, 39, 42, 45, 48, 54, 57])  # Brows, eyes, mouth
+LEFT_EYE_START = 36
+RIGHT_EYE_START = 42
+MOUTH_START = 48
+
+# Every unordered key-point pair, in the (i, j > i) order of the old nested loop
+_PAIR_A, _PAIR_B = np.triu_indices(len(KEY_POINTS), k=1)
+
+# Eye points relative to the eye start: vertical pairs (1, 5), (2, 4) and corners (0, 3)
+_EYE_STARTS = np.array([LEFT_EYE_START, RIGHT_EYE_START])[:, None]
+
+GEOMETRY_FEATURE_COUNT = len(_PAIR_A) + 4 + 2
+
+
+def _distance(landmarks, a, b):
+    """Euclidean distance between landmark indices a and b, broadcast over faces"""
+    return np.linalg.norm(landmarks[:, a] - landmarks[:, b], axis=-1)
+
+
+def _ratio(numerator, denominator):
+    """numerator / denominator, 0 where the denominator is not positive"""
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+def geometry_features(landmarks) -> np.ndarray:
+    """
+    Geometric features for one or many sets of 68 facial landmarks
+    Columns: the 55 key-point pair distances, then for the left and right
+    eye the eye aspect ratio and width/height ratio, then the mouth aspect
+    ratio and smile ratio.
+
+    Args:
+        landmarks: (68, 2) or (N, 68, 2) landmark coordinates
+    Returns:
+        np.ndarray: (GEOMETRY_FEATURE_COUNT,) or (N, GEOMETRY_FEATURE_COUNT)
+    """
+    landmarks = np.asarray(landmarks, dtype=float)
+    single = landmarks.ndim == 2
+    if single:
+        landmarks = landmarks[None]
+
+    # All pairwise key-point distances at once
+    key = landmarks[:, KEY_POINTS]
+    pair_distances = np.linalg.norm(key[:, _PAIR_A] - key[:, _PAIR_B], axis=-1)
+
+    # Both eyes together: (N, 2) per measurement
+    eye_v1 = _distance(landmarks, _EYE_STARTS + 1, _EYE_STARTS + 5)[..., 0]
+    eye_v2 = _distance(landmarks, _EYE_STARTS + 2, _EYE_STARTS + 4)[..., 0]
+    eye_h = _distance(landmarks, _EYE_STARTS + 0, _EYE_STARTS + 3)[..., 0]
+    eye_aspect = _ratio(eye_v1 + eye_v2, 2.0 * eye_h)
+    eye_width_height = _ratio(eye_h, eye_v1)
+    eyes = np.stack([eye_aspect, eye_width_height], axis=-1).reshape(len(landmarks), 4)
+
+    # Mouth aspect ratio and corner-to-corner over lip opening
+    mouth_v1 = _distance(landmarks, MOUTH_START + 2, MOUTH_START + 10)
+    mouth_v2 = _distance(landmarks, MOUTH_START + 4, MOUTH_START + 8)
+    mouth_h = _distance(landmarks, MOUTH_START + 0, MOUTH_START + 6)
+    mouth_aspect = _ratio(mouth_v1 + mouth_v2, 2.0 * mouth_h)
+    smile = mouth_h / (_distance(landmarks, MOUTH_START + 3, MOUTH_START + 9) + 0.001)
+
+    features = np.concatenate([pair_distances, eyes, mouth_aspect[:, None], smile[:, None]], axis=1)
+    return features[0] if single else features
@@ -0,0 +1,62 @@
+import hashlib
+import json
+import os
+
+from startup_timing import load_module
+
+# Directory for fitted model artifacts
+MODEL_CACHE_DIR = os.getenv('MODEL_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_cache'))
+
+# Bump when the artifact layout changes so old files are ignored
+CACHE_FORMAT = 1
+
+
+def artifact_key(csv_path, params):
+    """
+    Cache key for a model trained on csv_path with the given hyperparameters
+    Hashes the CSV contents (not its name or mtime), the parameters and the
+    scikit-learn version, so any change to data or settings retrains.
+    """
+    digest = hashlib.sha256()
+    with open(csv_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+
+    settings = {'params': params, 'sklearn': load_module('sklearn').__version__, 'format': CACHE_FORMAT}
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:32]
+
+
+def artifact_path(key):
+    return os.path.join(MODEL_CACHE_DIR, f"{key}.joblib")
+
+
+def load_artifact(key):
+    """
+    Load a cached artifact, or None on a miss
+    Large numpy arrays (tree node tables, support vectors) are memory-mapped
+    read-only, so workers sharing one artifact share its pages.
+    """
+    path = artifact_path(key)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        return load_module('joblib').load(path, mmap_mode='r')
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable model cache {path}: {e}")
+        return None
+
+
+def save_artifact(key, artifact):
+    """Write an artifact atomically so concurrent workers never read a partial file"""
+    os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+    path = artifact_path(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        load_module('joblib').dump(artifact, tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"⚠️ Could not save model cache {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
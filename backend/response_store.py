@@ -0,0 +1,254 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from ttl_cache import MISSING
+
+# SQLite file shared by every process of the backend
+API_CACHE_PATH = os.getenv('API_CACHE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api_cache.sqlite3'))
+
+# Total size of stored response bodies before least recently used rows are evicted
+API_CACHE_MAX_MB = float(os.getenv('API_CACHE_MAX_MB', 50))
+
+# Set to false to keep API responses in memory only
+API_CACHE = os.getenv('API_CACHE', 'true').lower() == 'true'
+
+# Query parameters that are credentials, not part of the request identity
+SECRET_PARAMS = ('key', 'access_token')
+
+
+def request_key(url, params=None):
+    """Stable key for a GET request: URL plus sorted parameters, secrets left out"""
+    params = {k: v for k, v in (params or {}).items() if k not in SECRET_PARAMS}
+    identity = json.dumps([url, sorted(params.items())], default=str)
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+class ResponseStore:
+    """
+    Persistent API response cache in a SQLite file
+    Raw response bodies are stored with an expiry time and survive
+    restarts. Any number of processes may share the file: SQLite's locking
+    (WAL journal plus a busy timeout) serialises writers, and each thread
+    keeps its own connection. Once the stored bodies exceed max_bytes the
+    least recently read rows are deleted. Database errors are reported and
+    treated as cache misses, so the API path keeps working without the file.
+    """
+
+    def __init__(self, path=None, max_bytes=None):
+        """
+        Args:
+            path (str): SQLite file (API_CACHE_PATH)
+            max_bytes (int): Size budget for stored bodies (API_CACHE_MAX_MB)
+        """
+        self.path = path or API_CACHE_PATH
+        self.max_bytes = int(max_bytes if max_bytes is not None else API_CACHE_MAX_MB * 1024 * 1024)
+        self.local = threading.local()
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+        self._connection()
+
+    def _connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    stored_at REAL NOT NULL DEFAULT 0
+                )
+            ''')
+            connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+            self.local.connection = connection
+        return connection
+
+    def get(self, key):
+        """Stored body for key if it has not expired, else MISSING"""
+        entry = self.get_entry(key)
+        return entry if entry is MISSING else entry[0]
+
+    def get_entry(self, key):
+        """(body, stored_at) for key if it has not expired, else MISSING"""
+        now = time.time()
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                'SELECT body, stored_at FROM responses WHERE key = ? AND expires_at > ?', (key, now)
+            ).fetchone()
+            if row is not None:
+                connection.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+        except sqlite3.Error as e:
+            self._error('read', e)
+            return MISSING
+
+        if row is None:
+            self.misses += 1
+            return MISSING
+        self.hits += 1
+        return row
+
+    def set(self, key, body, ttl):
+        """Store body for ttl seconds, then evict down to the size budget"""
+        if ttl <= 0:
+            return
+        now = time.time()
+        try:
+            connection = self._connection()
+            connection.execute(
+                'INSERT OR REPLACE INTO responses (key, body, size, expires_at, accessed_at, stored_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, body, len(body), now + ttl, now, now)
+            )
+            self.writes += 1
+            self._evict(connection, now)
+        except sqlite3.Error as e:
+            self._error('write', e)
+
+    def _evict(self, connection, now):
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            deleted = connection.execute('DELETE FROM responses WHERE expires_at <= ?', (now,)).rowcount
+            total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+            if total > self.max_bytes:
+                # Oldest reads first, until the bodies fit the budget again
+                excess = total - self.max_bytes
+                for key, size in connection.execute('SELECT key, size FROM responses ORDER BY accessed_at').fetchall():
+                    if excess <= 0:
+                        break
+                    connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    excess -= size
+                    deleted += 1
+            connection.execute('COMMIT')
+        except sqlite3.Error:
+            connection.execute('ROLLBACK')
+            raise
+        self.evictions += deleted
+
+    def claim(self, key, ttl):
+        """
+        Take a short exclusive lease on key, shared across processes
+        Returns True if this caller got it (no unexpired lease existed) and
+        False if another holder has it; the lease lapses after ttl seconds
+        or when release() is called. Without the database everybody wins.
+        """
+        lease = f'claim:{key}'
+        now = time.time()
+        try:
+            connection = self._connection()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                held = connection.execute(
+                    'SELECT 1 FROM responses WHERE key = ? AND expires_at > ?', (lease, now)
+                ).fetchone()
+                if held is None:
+                    connection.execute(
+                        'INSERT OR REPLACE INTO responses (key, body, size, expires_at, accessed_at, stored_at) '
+                        'VALUES (?, \'\', 0, ?, ?, ?)',
+                        (lease, now + ttl, now, now)
+                    )
+                connection.execute('COMMIT')
+            except sqlite3.Error:
+                connection.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            self._error('claim', e)
+            return True
+        return held is None
+
+    def release(self, key):
+        """Give up a lease taken with claim()"""
+        try:
+            self._connection().execute('DELETE FROM responses WHERE key = ?', (f'claim:{key}',))
+        except sqlite3.Error as e:
+            self._error('release', e)
+
+    def clear(self):
+        try:
+            self._connection().execute('DELETE FROM responses')
+        except sqlite3.Error as e:
+            self._error('clear', e)
+
+    def _error(self, action, e):
+        self.errors += 1
+        print(f"⚠️ API response cache {action} failed ({self.path}): {e}")
+
+    def get_stats(self):
+        """Hit/miss counters of this process plus the shared file's size"""
+        try:
+            entries, size = self._connection().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+        except sqlite3.Error:
+            entries, size = None, None
+
+        lookups = self.hits + self.misses
+        return {
+            'path': self.path,
+            'entries': entries,
+            'size_bytes': size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'evictions': self.evictions,
+            'errors': self.errors,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+def cached_get_json(http, store, url, ttl, params=None, headers=None, use_cache=True):
+    """
+    GET url with the requests session http and decode its JSON body, going
+    through store (a ResponseStore, or None for no persistent cache)
+    use_cache=False skips the stored copy but still saves the fresh one.
+    HTTP errors are raised as by requests (nothing is stored for them).
+    """
+    key = request_key(url, params)
+
+    if store is not None and use_cache:
+        body = store.get(key)
+        if body is not MISSING:
+            return json.loads(body)
+
+    response = http.get(url, params=params, headers=headers)
+    response.raise_for_status()
+    data = response.json()
+
+    if store is not None:
+        store.set(key, response.text, ttl)
+    return data
+
+
+_shared_store = None
+_store_failed = False
+_lock = threading.Lock()
+
+
+def get_response_store():
+    """Process-wide response store, or None when API_CACHE is off or the file cannot be opened"""
+    global _shared_store, _store_failed
+    if not API_CACHE:
+        return None
+    with _lock:
+        if _shared_store is None and not _store_failed:
+            try:
+                _shared_store = ResponseStore()
+            except (sqlite3.Error, OSError) as e:
+                _store_failed = True
+                print(f"⚠️ API response cache disabled, cannot open {API_CACHE_PATH}: {e}")
+        return _shared_store
@@ -1,9 +1,16 @@
 import cv2
 import numpy as np
+from frame_decoder import scale_box
+from face_detection import detect_faces, min_face_size
+from frame_context import as_frame_context
+from face_features import integral_feature_matrix
 
 class EmotionDetector:
     """Simple emotion detector using OpenCV without warnings"""
 
+    # Only the grayscale image is used, so frames can be decoded straight to gray
+    gray_input = True
+
     def __init__(self):
         """Initialize the emotion detector"""
         print("✅ Simple emotion detector initialized")
@@ -29,21 +36,39 @@ class EmotionDetector:
         Simple emotion detection based on image features
         Returns: (emotion, confidence)
         """
+        emotion, confidence, _ = self.analyze(frame)
+        return emotion, confidence
+
+    def analyze(self, frame, scale=1, tracker=None):
+        """
+        Emotion detection that also reports the face it used
+        frame may be BGR, grayscale or a FrameContext; scale is the factor
+        the frame was reduced by at decode time; tracker is an optional
+        per-session FaceTracker that narrows the face search
+        Returns: (emotion, confidence, face) with face as (x, y, w, h) in
+        original image coordinates, or None
+        """
         try:
+            ctx = as_frame_context(frame)
+
             # Check for black screen/camera issues
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            avg_brightness = np.mean(gray)
+            gray = ctx.gray
+            avg_brightness = ctx.brightness
             brightness_threshold = 20
 
             if avg_brightness < brightness_threshold:
-                return 'neutral', 0.1
+                return 'neutral', 0.1, None
 
             # Simple emotion detection based on brightness and contrast
-            contrast = np.std(gray) / (avg_brightness + 1e-7)
+            contrast = ctx.contrast
+
+            # Face detection using OpenCV (minimum face size in original pixels)
+            min_face = min_face_size(scale)
 
-            # Face detection using OpenCV
-            face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-            faces = face_cascade.detectMultiScale(gray, 1.1, 5, minSize=(50, 50))
+            def find_faces(image):
+                return detect_faces(image, 1.1, 5, min_size=min_face)
+
+            faces = tracker.detect(gray, find_faces) if tracker is not None else find_faces(gray)
 
             if len(faces) > 0:
                 # Use largest face
@@ -71,14 +96,61 @@ class EmotionDetector:
                     emotion = 'neutral'
                     confidence = 0.6
 
-                return emotion, confidence
+                return emotion, confidence, scale_box((x, y, w, h), scale)
             else:
                 # No face detected
-                return 'neutral', 0.5
+                return 'neutral', 0.5, None
+
+        except Exception as e:
+            print(f"Emotion detection error: {e}")
+            return 'neutral', 0.5, None
+
+    def analyze_faces(self, frame, scale=1):
+        """
+        Emotion detection for every face in the frame
+        All faces are classified in one vectorised pass over integral-image
+        features rather than a loop of single-face calls
+        Returns: (emotion, confidence, face, faces) where the first three
+        describe the largest face exactly as analyze() does, and faces is
+        a list of {'box', 'emotion', 'confidence'}, largest face first
+        """
+        try:
+            ctx = as_frame_context(frame)
+
+            # Check for black screen/camera issues
+            brightness_threshold = 20
+            if ctx.brightness < brightness_threshold:
+                return 'neutral', 0.1, None, []
+
+            min_face = min_face_size(scale)
+            faces = detect_faces(ctx.gray, 1.1, 5, min_size=min_face)
+
+            if len(faces) == 0:
+                # No face detected
+                return 'neutral', 0.5, None, []
+
+            faces = sorted((tuple(f) for f in faces), key=lambda f: f[2] * f[3], reverse=True)
+            features = integral_feature_matrix(ctx, faces)
+            face_brightness = features[:, 0]
+            face_contrast = features[:, 1]
+
+            # Same rules as analyze(), evaluated for all faces at once
+            conditions = [face_brightness > 160, face_brightness < 90, face_contrast > 0.4, face_contrast < 0.2]
+            emotions = np.select(conditions, ['happy', 'sad', 'excited', 'calm'], 'neutral')
+            confidences = np.select(conditions, [0.8, 0.7, 0.75, 0.7], 0.6)
+
+            results = [{
+                'box': scale_box(box, scale),
+                'emotion': str(emotion),
+                'confidence': float(confidence)
+            } for box, emotion, confidence in zip(faces, emotions, confidences)]
+
+            largest = results[0]
+            return largest['emotion'], largest['confidence'], largest['box'], results
 
         except Exception as e:
             print(f"Emotion detection error: {e}")
-            return 'neutral', 0.5
+            return 'neutral', 0.5, None, []
 
     def get_face_with_emotion(self, frame):
         """
@@ -1,7 +1,8 @@
 import os
-import requests
 from typing import List, Dict, Optional, Tuple
 import time
+from http_session import get_session
+from response_store import cached_get_json, get_response_store
 
 class SpotifyIntegration:
     """Spotify API integration for emotion-based music recommendations"""
@@ -12,6 +13,13 @@ class SpotifyIntegration:
         self.client_secret = os.getenv('SPOTIPY_CLIENT_SECRET')
         self.access_token = None
         self.token_expires_at = 0
+        self.auth_url = 'https://accounts.spotify.com/api/token'
+        self.base_url = 'https://api.spotify.com/v1'
+        # Pooled keep-alive session with timeouts and retries
+        self.http = get_session()
+        # Searches and playlist contents persisted on disk (SPOTIFY_CACHE_TTL seconds)
+        self.store = get_response_store()
+        self.cache_ttl = float(os.getenv('SPOTIFY_CACHE_TTL', 3600))
 
         if not self.client_id or not self.client_secret:
             print("⚠️  Spotify credentials not found. Set SPOTIPY_CLIENT_ID and SPOTIPY_CLIENT_SECRET")
@@ -22,7 +30,7 @@ class SpotifyIntegration:
     def _authenticate(self) -> bool:
         """Authenticate with Spotify API"""
         try:
-            auth_url = 'https://accounts.spotify.com/api/token'
+            auth_url = self.auth_url
             auth_data = {
                 'grant_type': 'client_credentials'
             }
@@ -30,7 +38,7 @@ class SpotifyIntegration:
                 'Authorization': f'Basic {self._get_auth_header()}'
             }
 
-            response = requests.post(auth_url, data=auth_data, headers=auth_headers)
+            response = self.http.post(auth_url, data=auth_data, headers=auth_headers)
             response.raise_for_status()
 
             token_data = response.json()
@@ -63,7 +71,7 @@ class SpotifyIntegration:
         self._ensure_valid_token()
 
         try:
-            search_url = 'https://api.spotify.com/v1/search'
+            search_url = f'{self.base_url}/search'
             headers = {
                 'Authorization': f'Bearer {self.access_token}'
             }
@@ -73,10 +81,7 @@ class SpotifyIntegration:
                 'limit': limit
             }
 
-            response = requests.get(search_url, headers=headers, params=params)
-            response.raise_for_status()
-
-            data = response.json()
+            data = cached_get_json(self.http, self.store, search_url, self.cache_ttl, params=params, headers=headers)
             return data.get('tracks', {}).get('items', [])
 
         except Exception as e:
@@ -91,7 +96,7 @@ class SpotifyIntegration:
         self._ensure_valid_token()
 
         try:
-            playlist_url = f'https://api.spotify.com/v1/playlists/{playlist_id}/tracks'
+            playlist_url = f'{self.base_url}/playlists/{playlist_id}/tracks'
             headers = {
                 'Authorization': f'Bearer {self.access_token}'
             }
@@ -99,10 +104,7 @@ class SpotifyIntegration:
                 'limit': limit
             }
 
-            response = requests.get(playlist_url, headers=headers, params=params)
-            response.raise_for_status()
-
-            data = response.json()
+            data = cached_get_json(self.http, self.store, playlist_url, self.cache_ttl, params=params, headers=headers)
             return data.get('items', [])
 
         except Exception as e:
@@ -259,12 +261,12 @@ class SpotifyIntegration:
         self._ensure_valid_token()
 
         try:
-            track_url = f'https://api.spotify.com/v1/tracks/{track_id}'
+            track_url = f'{self.base_url}/tracks/{track_id}'
             headers = {
                 'Authorization': f'Bearer {self.access_token}'
             }
 
-            response = requests.get(track_url, headers=headers)
+            response = self.http.get(track_url, headers=headers)
             response.raise_for_status()
 
             return response.json()
@@ -0,0 +1,101 @@
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Reference point for the report: when this module was first imported
+_STARTED = time.perf_counter()
+
+# Stage or module name -> milliseconds, in the order they were recorded
+STARTUP_TIMINGS = {}
+_last_mark = _STARTED
+_lock = threading.Lock()
+
+# Optional modules that failed to import, so the attempt is not repeated
+_missing = set()
+
+
+def mark(name):
+    """Record the time since the previous mark (or process start) as stage name"""
+    global _last_mark
+    now = time.perf_counter()
+    with _lock:
+        STARTUP_TIMINGS[name] = round((now - _last_mark) * 1000, 1)
+        _last_mark = now
+
+
+@contextmanager
+def timed(name):
+    """Record how long the with-block takes as stage name"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _lock:
+            STARTUP_TIMINGS[name] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def module_available(name):
+    """True if the module can be imported, checked without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def load_module(name, optional=False):
+    """
+    Import a heavy dependency on first use and record how long it took
+    Returns the module, or None for a missing optional module
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if name in _missing:
+        return None
+
+    started = time.perf_counter()
+    try:
+        module = importlib.import_module(name)
+    except ImportError as e:
+        if not optional:
+            raise
+        _missing.add(name)
+        print(f"⚠️  {name} not available ({e})")
+        return None
+
+    elapsed = round((time.perf_counter() - started) * 1000, 1)
+    with _lock:
+        STARTUP_TIMINGS[f"import {name}"] = elapsed
+    print(f"✅ {name} loaded in {elapsed:.0f} ms")
+    return module
+
+
+def startup_report():
+    """Recorded stage and import timings (ms) plus time since start"""
+    with _lock:
+        return {
+            'pid': os.getpid(),
+            'since_start_ms': round((time.perf_counter() - _STARTED) * 1000, 1),
+            'timings_ms': dict(STARTUP_TIMINGS)
+        }
+
+
+def print_startup_report(title="Startup timing"):
+    report = startup_report()
+    print(f"⏱️  {title} (pid {report['pid']}, {report['since_start_ms']:.0f} ms since start)")
+    for name, ms in report['timings_ms'].items():
+        print(f"   {ms:>9.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    # Cold-start cost of one detector backend: python startup_timing.py [simple|advanced|dnn]
+    from detector_backends import create_detector
+    mark('import detector_backends')
+    name = sys.argv[1] if len(sys.argv) > 1 else None
+    with timed(f"create detector '{name or os.getenv('EMOTION_DETECTOR', 'simple')}'"):
+        create_detector(name)
+    print_startup_report()
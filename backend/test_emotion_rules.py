@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Rule table equivalence test
+Checks emotion_rules.score_emotions against the if-chain that
+EmotionDetector._calculate_emotion_scores_enhanced used before the rules
+became a table, on random faces and on every threshold boundary
+"""
+
+import random
+
+import numpy as np
+
+from emotion_rules import EMOTIONS, feature_matrix, score_emotions
+
+TOLERANCE = 1e-12
+
+
+def reference_scores(features):
+    """The original if-chain, kept verbatim as the reference"""
+    scores = {
+        'happy': 0.0,
+        'sad': 0.0,
+        'stressed': 0.0,
+        'neutral': 0.0,
+        'excited': 0.0,
+        'calm': 0.0,
+        'focused': 0.0,
+        'tired': 0.0
+    }
+
+    brightness = features['brightness']
+    contrast = features['contrast']
+    symmetry = features['symmetry']
+
+    # Brightness-based emotions
+    if brightness > 150:
+        scores['happy'] += 0.4
+        scores['excited'] += 0.3
+    elif brightness < 100:
+        scores['sad'] += 0.4
+        scores['tired'] += 0.2
+    elif brightness < 120:
+        scores['stressed'] += 0.3
+        scores['focused'] += 0.2
+
+    # Contrast-based emotions
+    if contrast > 0.7:
+        scores['excited'] += 0.3
+        scores['focused'] += 0.2
+    elif contrast < 0.4:
+        scores['calm'] += 0.3
+        scores['tired'] += 0.2
+
+    # Symmetry-based emotions
+    if symmetry > 0.8:
+        scores['calm'] += 0.3
+        scores['neutral'] += 0.2
+    elif symmetry < 0.6:
+        scores['stressed'] += 0.3
+        scores['excited'] += 0.2
+
+    # Eye region analysis
+    eye_brightness = features.get('eye_region', brightness)
+    if eye_brightness > brightness + 15:
+        scores['excited'] += 0.2
+        scores['focused'] += 0.3
+    elif eye_brightness < brightness - 10:
+        scores['tired'] += 0.3
+
+    # Mouth region analysis
+    mouth_brightness = features.get('mouth_region', brightness)
+    if mouth_brightness > brightness + 20:
+        scores['happy'] += 0.5
+        scores['excited'] += 0.3
+    elif mouth_brightness < brightness - 15:
+        scores['sad'] += 0.4
+
+    # Normalize scores
+    total = sum(scores.values())
+    if total > 0:
+        scores = {k: v / total for k, v in scores.items()}
+
+    return [scores[emotion] for emotion in EMOTIONS]
+
+
+def random_features(rng):
+    """Random face features, often sitting exactly on a threshold"""
+    brightness = rng.choice([100, 120, 150, 99.999, 150.001, rng.uniform(0, 255)])
+    features = {
+        'brightness': brightness,
+        'contrast': rng.choice([0.4, 0.7, rng.uniform(0, 1)]),
+        'symmetry': rng.choice([0.6, 0.8, rng.uniform(0, 1)]),
+    }
+    if rng.random() < 0.8:
+        features['eye_region'] = brightness + rng.choice([15, -10, rng.uniform(-40, 40)])
+    if rng.random() < 0.8:
+        features['mouth_region'] = brightness + rng.choice([20, -15, rng.uniform(-40, 40)])
+    return features
+
+
+def compare(cases, label):
+    """Score cases both ways and report the largest difference"""
+    expected = np.array([reference_scores(features) for features in cases])
+    actual = score_emotions(feature_matrix(cases))
+
+    diff = np.abs(expected - actual).max(axis=1)
+    mismatches = int((diff > TOLERANCE).sum())
+    if mismatches:
+        worst = int(diff.argmax())
+        print(f"❌ {label}: {mismatches}/{len(cases)} cases differ, worst {diff[worst]:.3g} for {cases[worst]}")
+        return False
+    print(f"✅ {label}: {len(cases)} cases match (max difference {diff.max():.3g})")
+    return True
+
+
+def test_boundaries():
+    """Every combination of threshold values, with and without regions"""
+    cases = []
+    for brightness in (99.999, 100, 119.999, 120, 150, 150.001):
+        for contrast in (0.4, 0.5, 0.7, 0.701):
+            for symmetry in (0.6, 0.7, 0.8, 0.801):
+                for eye in (None, 15, 15.001, -10, -10.001):
+                    for mouth in (None, 20, 20.001, -15, -15.001):
+                        features = {'brightness': brightness, 'contrast': contrast, 'symmetry': symmetry}
+                        if eye is not None:
+                            features['eye_region'] = brightness + eye
+                        if mouth is not None:
+                            features['mouth_region'] = brightness + mouth
+                        cases.append(features)
+    return compare(cases, "Boundary values")
+
+
+def test_random(count=20000):
+    """Random faces from a fixed seed"""
+    rng = random.Random(42)
+    return compare([random_features(rng) for _ in range(count)], "Random faces")
+
+
+def test_no_rule_fires():
+    """A face no rule matches keeps all-zero scores"""
+    features = {'brightness': 130, 'contrast': 0.5, 'symmetry': 0.7}
+    return compare([features], "No rule fires")
+
+
+def run_tests():
+    print("🧪 Testing rule table against the original if-chain...")
+    results = [test_boundaries(), test_random(), test_no_rule_fires()]
+    passed = sum(results)
+    print(f"\nOverall: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    exit(0 if success else 1)
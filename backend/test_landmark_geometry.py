@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Landmark geometry equivalence test
+Checks landmark_geometry.geometry_features against the per-landmark loop
+ImageClassifier used before the features were vectorised, for single
+faces, batches and degenerate (collapsed) eyes and mouths
+"""
+
+import numpy as np
+
+from landmark_geometry import GEOMETRY_FEATURE_COUNT, geometry_features
+
+TOLERANCE = 1e-9
+
+
+# The original loop and its helpers, kept verbatim as the reference
+
+def _eye_aspect_ratio(eye):
+    if len(eye) < 6:
+        return 0.0
+
+    # Vertical distances
+    v1 = np.linalg.norm(eye[1] - eye[5])
+    v2 = np.linalg.norm(eye[2] - eye[4])
+
+    # Horizontal distance
+    h = np.linalg.norm(eye[0] - eye[3])
+
+    return (v1 + v2) / (2.0 * h) if h > 0 else 0.0
+
+
+def _mouth_aspect_ratio(mouth):
+    if len(mouth) < 12:
+        return 0.0
+
+    # Vertical distances
+    v1 = np.linalg.norm(mouth[2] - mouth[10])
+    v2 = np.linalg.norm(mouth[4] - mouth[8])
+
+    # Horizontal distance
+    h = np.linalg.norm(mouth[0] - mouth[6])
+
+    return (v1 + v2) / (2.0 * h) if h > 0 else 0.0
+
+
+def _calculate_eye_features(eye_points):
+    features = []
+
+    if len(eye_points) >= 6:
+        # Eye aspect ratio (EAR)
+        ear = _eye_aspect_ratio(eye_points)
+        features.append(ear)
+
+        # Eye width/height ratio
+        width = np.linalg.norm(eye_points[0] - eye_points[3])
+        height = np.linalg.norm(eye_points[1] - eye_points[5])
+        if height > 0:
+            features.append(width / height)
+        else:
+            features.append(0)
+
+    return features
+
+
+def _calculate_mouth_features(mouth_points):
+    features = []
+
+    if len(mouth_points) >= 12:
+        # Mouth aspect ratio (MAR)
+        mar = _mouth_aspect_ratio(mouth_points)
+        features.append(mar)
+
+        # Smile detection (corner distances)
+        left_corner = mouth_points[0]
+        right_corner = mouth_points[6]
+        top_lip = mouth_points[3]
+        bottom_lip = mouth_points[9]
+
+        smile_ratio = np.linalg.norm(left_corner - right_corner) / (np.linalg.norm(top_lip - bottom_lip) + 0.001)
+        features.append(smile_ratio)
+
+    return features
+
+
+def reference_features(landmarks):
+    features = []
+
+    # Distance features between key points
+    key_points = [17, 21, 22, 26, 36, 39, 42, 45, 48, 54, 57]  # Jaw, eyes, nose, mouth
+
+    for i in range(len(key_points)):
+        for j in range(i + 1, len(key_points)):
+            p1 = landmarks[key_points[i]]
+            p2 = landmarks[key_points[j]]
+            dist = np.linalg.norm(p1 - p2)
+            features.append(dist)
+
+    left_eye = landmarks[36:42]
+    right_eye = landmarks[42:48]
+    mouth = landmarks[48:68]
+
+    features.extend(_calculate_eye_features(left_eye))
+    features.extend(_calculate_eye_features(right_eye))
+    features.extend(_calculate_mouth_features(mouth))
+
+    return np.array(features)
+
+
+def random_faces(count, seed=7):
+    """Random 68-point landmark sets inside a 48x48 face crop"""
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, 48, size=(count, 68, 2))
+
+
+def report(label, expected, actual):
+    if expected.shape != actual.shape:
+        print(f"❌ {label}: shape {actual.shape}, expected {expected.shape}")
+        return False
+    diff = float(np.abs(expected - actual).max())
+    if diff > TOLERANCE:
+        print(f"❌ {label}: max difference {diff:.3g}")
+        return False
+    print(f"✅ {label}: match (max difference {diff:.3g})")
+    return True
+
+
+def test_single_faces(count=2000):
+    """One (68, 2) face at a time, as ImageClassifier calls it"""
+    faces = random_faces(count)
+    expected = np.array([reference_features(face) for face in faces])
+    actual = np.array([geometry_features(face) for face in faces])
+    return report(f"{count} single faces", expected, actual)
+
+
+def test_batch(count=2000):
+    """(N, 68, 2) in one call gives the same rows"""
+    faces = random_faces(count, seed=11)
+    expected = np.array([reference_features(face) for face in faces])
+    actual = geometry_features(faces)
+    return report(f"Batch of {count}", expected, actual)
+
+
+def test_degenerate():
+    """Collapsed eyes and mouth hit the zero-denominator branches"""
+    faces = random_faces(4, seed=3)
+    faces[0, 36:42] = faces[0, 36]      # left eye is one point
+    faces[1, 42:48] = faces[1, 42]      # right eye is one point
+    faces[2, 48:68] = faces[2, 48]      # mouth is one point
+    faces[3, :] = 0.0                   # everything at the origin
+    expected = np.array([reference_features(face) for face in faces])
+    return report("Degenerate faces", expected, geometry_features(faces))
+
+
+def test_feature_count():
+    """GEOMETRY_FEATURE_COUNT matches the reference length"""
+    count = len(reference_features(random_faces(1)[0]))
+    if count != GEOMETRY_FEATURE_COUNT:
+        print(f"❌ Feature count {GEOMETRY_FEATURE_COUNT}, reference has {count}")
+        return False
+    print(f"✅ Feature count: {count}")
+    return True
+
+
+def run_tests():
+    print("🧪 Testing landmark geometry against the original loop...")
+    results = [test_feature_count(), test_single_faces(), test_batch(), test_degenerate()]
+    passed = sum(results)
+    print(f"\nOverall: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    exit(0 if success else 1)
@@ -1,7 +1,119 @@
+import json
 import os
-import requests
 from typing import List, Dict, Optional, Tuple
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from ttl_cache import TTLCache, MISSING
+from http_session import get_session
+from response_store import cached_get_json, get_response_store
+
+# Seconds one process may hold the shared refresh lease before others take over
+REFRESH_LEASE_SECONDS = 30
+
+# Playlist entries YouTube returns for removed videos
+UNAVAILABLE_TITLES = ('Deleted video', 'Private video')
+
+# Curated playlist per emotion: search query for YouTube plus fallback tracks
+EMOTION_PLAYLISTS = {
+    'happy': {
+        'name': 'Happy & Uplifting Music',
+        'description': 'Energetic and joyful tracks to boost your mood',
+        'search_query': 'happy uplifting music playlist',
+        'fallback_tracks': [
+            {'title': 'Happy - Pharrell Williams', 'url': 'https://www.youtube.com/watch?v=ZbZSe6N_BXs'},
+            {'title': 'Can\'t Stop the Feeling! - Justin Timberlake', 'url': 'https://www.youtube.com/watch?v=ru0K8uYEZWw'},
+            {'title': 'Uptown Funk - Mark Ronson ft. Bruno Mars', 'url': 'https://www.youtube.com/watch?v=OPf0YbXqDm0'},
+            {'title': 'Walking on Sunshine - Katrina and the Waves', 'url': 'https://www.youtube.com/watch?v=iPUmE-tne5U'},
+            {'title': 'Don\'t Worry, Be Happy - Bobby McFerrin', 'url': 'https://www.youtube.com/watch?v=d-diB65scQU'}
+        ]
+    },
+    'sad': {
+        'name': 'Emotional & Reflective Music',
+        'description': 'Melancholic and introspective songs for processing emotions',
+        'search_query': 'sad emotional music playlist',
+        'fallback_tracks': [
+            {'title': 'Someone Like You - Adele', 'url': 'https://www.youtube.com/watch?v=hLQl3WQQoQ0'},
+            {'title': 'Mad World - Gary Jules', 'url': 'https://www.youtube.com/watch?v=4N3N1MlvVc4'},
+            {'title': 'Hurt - Johnny Cash', 'url': 'https://www.youtube.com/watch?v=vt1Pwfnh5pc'},
+            {'title': 'The Sound of Silence - Simon & Garfunkel', 'url': 'https://www.youtube.com/watch?v=4zLfCnGVeL4'},
+            {'title': 'Yesterday - The Beatles', 'url': 'https://www.youtube.com/watch?v=NrgmdOz227I'}
+        ]
+    },
+    'stressed': {
+        'name': 'Calming & Stress Relief Music',
+        'description': 'Relaxing music to reduce stress and anxiety',
+        'search_query': 'stress relief calming music playlist',
+        'fallback_tracks': [
+            {'title': 'Weightless - Marconi Union', 'url': 'https://www.youtube.com/watch?v=UfcAVejs1Ac'},
+            {'title': 'River Flows in You - Yiruma', 'url': 'https://www.youtube.com/watch?v=7maJOI3QMu0'},
+            {'title': 'Comptine d\'un autre été - Yann Tiersen', 'url': 'https://www.youtube.com/watch?v=2TE2Lx9XIKU'},
+            {'title': 'The Night - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=8L63lTOLKJA'},
+            {'title': 'Experience - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=5jzgTFw2T6w'}
+        ]
+    },
+    'excited': {
+        'name': 'Energetic & Motivational Music',
+        'description': 'High-energy tracks to keep you motivated and pumped up',
+        'search_query': 'energetic motivational music playlist',
+        'fallback_tracks': [
+            {'title': 'Eye of the Tiger - Survivor', 'url': 'https://www.youtube.com/watch?v=btPJPFnesV4'},
+            {'title': 'We Will Rock You - Queen', 'url': 'https://www.youtube.com/watch?v=-tJYN-eG1zk'},
+            {'title': 'Thunderstruck - AC/DC', 'url': 'https://www.youtube.com/watch?v=v2AC41dglnM'},
+            {'title': 'Livin\' on a Prayer - Bon Jovi', 'url': 'https://www.youtube.com/watch?v=lDK9QqIzhwk'},
+            {'title': 'Don\'t Stop Believin\' - Journey', 'url': 'https://www.youtube.com/watch?v=1k8craCGpgs'}
+        ]
+    },
+    'calm': {
+        'name': 'Peaceful & Ambient Music',
+        'description': 'Soft and tranquil music for relaxation and peace',
+        'search_query': 'peaceful ambient music playlist',
+        'fallback_tracks': [
+            {'title': 'The Journey - 911 Band', 'url': 'https://www.youtube.com/watch?v=8N_ZjC9Q9Z8'},
+            {'title': 'I Giorni - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=4TR1y5Q0JJ4'},
+            {'title': 'Divenire - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=lWh4Ll1ogK4'},
+            {'title': 'Nuvole Bianche - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=0pVx8zM7zRY'},
+            {'title': 'Elegy for the Arctic - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=7MAVkJ9WJws'}
+        ]
+    },
+    'tired': {
+        'name': 'Sleep & Relaxation Music',
+        'description': 'Gentle music for rest and peaceful sleep',
+        'search_query': 'sleep relaxation music playlist',
+        'fallback_tracks': [
+            {'title': 'Sleep - Eric Whitacre', 'url': 'https://www.youtube.com/watch?v=7EYAUazLI9k'},
+            {'title': 'The Night - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=8L63lTOLKJA'},
+            {'title': 'I Giorni - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=4TR1y5Q0JJ4'},
+            {'title': 'Divenire - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=lWh4Ll1ogK4'},
+            {'title': 'Nuvole Bianche - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=0pVx8zM7zRY'}
+        ]
+    },
+    'focused': {
+        'name': 'Concentration & Study Music',
+        'description': 'Instrumental music to help you focus and concentrate',
+        'search_query': 'concentration study music playlist',
+        'fallback_tracks': [
+            {'title': 'River Flows in You - Yiruma', 'url': 'https://www.youtube.com/watch?v=7maJOI3QMu0'},
+            {'title': 'Comptine d\'un autre été - Yann Tiersen', 'url': 'https://www.youtube.com/watch?v=2TE2Lx9XIKU'},
+            {'title': 'Experience - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=5jzgTFw2T6w'},
+            {'title': 'I Giorni - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=4TR1y5Q0JJ4'},
+            {'title': 'The Journey - 911 Band', 'url': 'https://www.youtube.com/watch?v=8N_ZjC9Q9Z8'}
+        ]
+    },
+    'neutral': {
+        'name': 'Chill & Background Music',
+        'description': 'Easy listening music for everyday moments',
+        'search_query': 'chill background music playlist',
+        'fallback_tracks': [
+            {'title': 'Take Five - Dave Brubeck', 'url': 'https://www.youtube.com/watch?v=vmDDOFXSgAs'},
+            {'title': 'What a Wonderful World - Louis Armstrong', 'url': 'https://www.youtube.com/watch?v=A3yCcXgbKrE'},
+            {'title': 'Fly Me to the Moon - Frank Sinatra', 'url': 'https://www.youtube.com/watch?v=ZEcqHA7dbwM'},
+            {'title': 'Feeling Good - Nina Simone', 'url': 'https://www.youtube.com/watch?v=oHRNrgDIJfw'},
+            {'title': 'At Last - Etta James', 'url': 'https://www.youtube.com/watch?v=oz4RDZrTpHU'}
+        ]
+    }
+}
+
 
 class YouTubeIntegration:
     """YouTube API integration for emotion-based music recommendations"""
@@ -10,6 +122,39 @@ class YouTubeIntegration:
         """Initialize YouTube API client"""
         self.api_key = os.getenv('YOUTUBE_API_KEY')
         self.base_url = 'https://www.googleapis.com/youtube/v3'
+        # Pooled keep-alive session with timeouts and retries
+        self.http = get_session()
+
+        # Recommendations, searches and playlist contents change slowly, so
+        # answers are cached instead of calling the API on every frame
+        self.cache = TTLCache(
+            max_entries=int(os.getenv('YOUTUBE_CACHE_SIZE', 256)),
+            ttl=float(os.getenv('YOUTUBE_CACHE_TTL', 3600))
+        )
+        # Raw API responses persisted on disk, shared by every process and
+        # kept across restarts
+        self.store = get_response_store()
+        # Curated fallback results stand in for failed lookups; retry sooner
+        self.fallback_ttl = float(os.getenv('YOUTUBE_FALLBACK_TTL', 60))
+
+        # 'concurrent' reads videos from every candidate playlist in parallel
+        # under one deadline and merges them; 'single' reads only the top one
+        self.fetch_mode = os.getenv('YOUTUBE_FETCH_MODE', 'concurrent').lower()
+        self.candidate_playlists = int(os.getenv('YOUTUBE_CANDIDATE_PLAYLISTS', 3))
+        self.fetch_deadline = float(os.getenv('YOUTUBE_FETCH_DEADLINE', 5))
+        self.fetch_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('YOUTUBE_FETCH_WORKERS', 8)),
+            thread_name_prefix='youtube-fetch'
+        )
+
+        # Background refresher state: emotion -> {'recommendations', 'fallback', 'fetched_at'}
+        self.warm = {}
+        self.refresh_interval = float(os.getenv('YOUTUBE_REFRESH_INTERVAL', self.cache.ttl * 0.8))
+        self.refresh_limit = 5
+        self.refresh_counts = {'refreshes': 0, 'failures': 0, 'shared': 0}
+        self.refresh_lock = threading.Lock()
+        self.refresh_stop = threading.Event()
+        self.refresh_thread = None
 
         if not self.api_key:
             print("⚠️  YouTube API key not found. Set YOUTUBE_API_KEY")
@@ -17,11 +162,16 @@ class YouTubeIntegration:
 
         print("✅ YouTube API initialized successfully")
 
-    def search_playlists(self, query: str, max_results: int = 10) -> List[Dict]:
+    def search_playlists(self, query: str, max_results: int = 10, use_cache: bool = True) -> List[Dict]:
         """Search for YouTube playlists by query"""
         if not self.api_key:
             return []
 
+        cache_key = ('search', query, max_results)
+        cached = self.cache.get(cache_key) if use_cache else MISSING
+        if cached is not MISSING:
+            return cached
+
         try:
             search_url = f'{self.base_url}/search'
             params = {
@@ -32,10 +182,7 @@ class YouTubeIntegration:
                 'key': self.api_key
             }
 
-            response = requests.get(search_url, params=params)
-            response.raise_for_status()
-
-            data = response.json()
+            data = cached_get_json(self.http, self.store, search_url, self.cache.ttl, params=params, use_cache=use_cache)
             playlists = []
 
             for item in data.get('items', []):
@@ -49,17 +196,23 @@ class YouTubeIntegration:
                 }
                 playlists.append(playlist)
 
+            self.cache.set(cache_key, playlists)
             return playlists
 
         except Exception as e:
             print(f"❌ YouTube playlist search failed: {e}")
             return []
 
-    def get_playlist_videos(self, playlist_id: str, max_results: int = 20) -> List[Dict]:
+    def get_playlist_videos(self, playlist_id: str, max_results: int = 20, use_cache: bool = True) -> List[Dict]:
         """Get videos from a YouTube playlist"""
         if not self.api_key:
             return []
 
+        cache_key = ('playlist', playlist_id, max_results)
+        cached = self.cache.get(cache_key) if use_cache else MISSING
+        if cached is not MISSING:
+            return cached
+
         try:
             playlist_url = f'{self.base_url}/playlistItems'
             params = {
@@ -69,10 +222,7 @@ class YouTubeIntegration:
                 'key': self.api_key
             }
 
-            response = requests.get(playlist_url, params=params)
-            response.raise_for_status()
-
-            data = response.json()
+            data = cached_get_json(self.http, self.store, playlist_url, self.cache.ttl, params=params, use_cache=use_cache)
             videos = []
 
             for item in data.get('items', []):
@@ -87,6 +237,7 @@ class YouTubeIntegration:
                 }
                 videos.append(video)
 
+            self.cache.set(cache_key, videos)
             return videos
 
         except Exception as e:
@@ -95,150 +246,115 @@ class YouTubeIntegration:
 
     def get_emotion_playlist(self, emotion: str) -> Dict:
         """Get a curated playlist for the given emotion using YouTube"""
-        emotion_playlists = {
-            'happy': {
-                'name': 'Happy & Uplifting Music',
-                'description': 'Energetic and joyful tracks to boost your mood',
-                'search_query': 'happy uplifting music playlist',
-                'fallback_tracks': [
-                    {'title': 'Happy - Pharrell Williams', 'url': 'https://www.youtube.com/watch?v=ZbZSe6N_BXs'},
-                    {'title': 'Can\'t Stop the Feeling! - Justin Timberlake', 'url': 'https://www.youtube.com/watch?v=ru0K8uYEZWw'},
-                    {'title': 'Uptown Funk - Mark Ronson ft. Bruno Mars', 'url': 'https://www.youtube.com/watch?v=OPf0YbXqDm0'},
-                    {'title': 'Walking on Sunshine - Katrina and the Waves', 'url': 'https://www.youtube.com/watch?v=iPUmE-tne5U'},
-                    {'title': 'Don\'t Worry, Be Happy - Bobby McFerrin', 'url': 'https://www.youtube.com/watch?v=d-diB65scQU'}
-                ]
-            },
-            'sad': {
-                'name': 'Emotional & Reflective Music',
-                'description': 'Melancholic and introspective songs for processing emotions',
-                'search_query': 'sad emotional music playlist',
-                'fallback_tracks': [
-                    {'title': 'Someone Like You - Adele', 'url': 'https://www.youtube.com/watch?v=hLQl3WQQoQ0'},
-                    {'title': 'Mad World - Gary Jules', 'url': 'https://www.youtube.com/watch?v=4N3N1MlvVc4'},
-                    {'title': 'Hurt - Johnny Cash', 'url': 'https://www.youtube.com/watch?v=vt1Pwfnh5pc'},
-                    {'title': 'The Sound of Silence - Simon & Garfunkel', 'url': 'https://www.youtube.com/watch?v=4zLfCnGVeL4'},
-                    {'title': 'Yesterday - The Beatles', 'url': 'https://www.youtube.com/watch?v=NrgmdOz227I'}
-                ]
-            },
-            'stressed': {
-                'name': 'Calming & Stress Relief Music',
-                'description': 'Relaxing music to reduce stress and anxiety',
-                'search_query': 'stress relief calming music playlist',
-                'fallback_tracks': [
-                    {'title': 'Weightless - Marconi Union', 'url': 'https://www.youtube.com/watch?v=UfcAVejs1Ac'},
-                    {'title': 'River Flows in You - Yiruma', 'url': 'https://www.youtube.com/watch?v=7maJOI3QMu0'},
-                    {'title': 'Comptine d\'un autre été - Yann Tiersen', 'url': 'https://www.youtube.com/watch?v=2TE2Lx9XIKU'},
-                    {'title': 'The Night - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=8L63lTOLKJA'},
-                    {'title': 'Experience - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=5jzgTFw2T6w'}
-                ]
-            },
-            'excited': {
-                'name': 'Energetic & Motivational Music',
-                'description': 'High-energy tracks to keep you motivated and pumped up',
-                'search_query': 'energetic motivational music playlist',
-                'fallback_tracks': [
-                    {'title': 'Eye of the Tiger - Survivor', 'url': 'https://www.youtube.com/watch?v=btPJPFnesV4'},
-                    {'title': 'We Will Rock You - Queen', 'url': 'https://www.youtube.com/watch?v=-tJYN-eG1zk'},
-                    {'title': 'Thunderstruck - AC/DC', 'url': 'https://www.youtube.com/watch?v=v2AC41dglnM'},
-                    {'title': 'Livin\' on a Prayer - Bon Jovi', 'url': 'https://www.youtube.com/watch?v=lDK9QqIzhwk'},
-                    {'title': 'Don\'t Stop Believin\' - Journey', 'url': 'https://www.youtube.com/watch?v=1k8craCGpgs'}
-                ]
-            },
-            'calm': {
-                'name': 'Peaceful & Ambient Music',
-                'description': 'Soft and tranquil music for relaxation and peace',
-                'search_query': 'peaceful ambient music playlist',
-                'fallback_tracks': [
-                    {'title': 'The Journey - 911 Band', 'url': 'https://www.youtube.com/watch?v=8N_ZjC9Q9Z8'},
-                    {'title': 'I Giorni - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=4TR1y5Q0JJ4'},
-                    {'title': 'Divenire - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=lWh4Ll1ogK4'},
-                    {'title': 'Nuvole Bianche - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=0pVx8zM7zRY'},
-                    {'title': 'Elegy for the Arctic - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=7MAVkJ9WJws'}
-                ]
-            },
-            'tired': {
-                'name': 'Sleep & Relaxation Music',
-                'description': 'Gentle music for rest and peaceful sleep',
-                'search_query': 'sleep relaxation music playlist',
-                'fallback_tracks': [
-                    {'title': 'Sleep - Eric Whitacre', 'url': 'https://www.youtube.com/watch?v=7EYAUazLI9k'},
-                    {'title': 'The Night - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=8L63lTOLKJA'},
-                    {'title': 'I Giorni - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=4TR1y5Q0JJ4'},
-                    {'title': 'Divenire - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=lWh4Ll1ogK4'},
-                    {'title': 'Nuvole Bianche - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=0pVx8zM7zRY'}
-                ]
-            },
-            'focused': {
-                'name': 'Concentration & Study Music',
-                'description': 'Instrumental music to help you focus and concentrate',
-                'search_query': 'concentration study music playlist',
-                'fallback_tracks': [
-                    {'title': 'River Flows in You - Yiruma', 'url': 'https://www.youtube.com/watch?v=7maJOI3QMu0'},
-                    {'title': 'Comptine d\'un autre été - Yann Tiersen', 'url': 'https://www.youtube.com/watch?v=2TE2Lx9XIKU'},
-                    {'title': 'Experience - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=5jzgTFw2T6w'},
-                    {'title': 'I Giorni - Ludovico Einaudi', 'url': 'https://www.youtube.com/watch?v=4TR1y5Q0JJ4'},
-                    {'title': 'The Journey - 911 Band', 'url': 'https://www.youtube.com/watch?v=8N_ZjC9Q9Z8'}
-                ]
-            },
-            'neutral': {
-                'name': 'Chill & Background Music',
-                'description': 'Easy listening music for everyday moments',
-                'search_query': 'chill background music playlist',
-                'fallback_tracks': [
-                    {'title': 'Take Five - Dave Brubeck', 'url': 'https://www.youtube.com/watch?v=vmDDOFXSgAs'},
-                    {'title': 'What a Wonderful World - Louis Armstrong', 'url': 'https://www.youtube.com/watch?v=A3yCcXgbKrE'},
-                    {'title': 'Fly Me to the Moon - Frank Sinatra', 'url': 'https://www.youtube.com/watch?v=ZEcqHA7dbwM'},
-                    {'title': 'Feeling Good - Nina Simone', 'url': 'https://www.youtube.com/watch?v=oHRNrgDIJfw'},
-                    {'title': 'At Last - Etta James', 'url': 'https://www.youtube.com/watch?v=oz4RDZrTpHU'}
-                ]
-            }
-        }
+        return EMOTION_PLAYLISTS.get(emotion, EMOTION_PLAYLISTS['neutral'])
 
-        return emotion_playlists.get(emotion, emotion_playlists['neutral'])
+    def fallback_recommendations(self, emotion: str, limit: int = 5) -> Dict:
+        """Curated tracks for the emotion, built without any network call"""
+        emotion_playlist = self.get_emotion_playlist(emotion)
+        tracks = [{
+            'name': track['title'],
+            'artist': 'Various Artists',
+            'youtube_id': None,
+            'youtube_url': track['url'],
+            'thumbnail': '',
+            'duration': '0:00'
+        } for track in emotion_playlist['fallback_tracks'][:limit]]
+        return self._recommendations(emotion, emotion_playlist, tracks)
 
     def get_recommendations(self, emotion: str, limit: int = 5) -> Dict:
-        """Get YouTube recommendations for emotion-based music"""
+        """
+        Get YouTube recommendations for emotion-based music
+        While the background refresher runs, emotions it keeps warm are
+        answered from memory without touching the network (curated tracks
+        until the first fetch lands); other requests use the response cache.
+        """
+        if self.refresher_running() and limit == self.refresh_limit:
+            key = emotion if emotion in EMOTION_PLAYLISTS else 'neutral'
+            with self.refresh_lock:
+                entry = self.warm.get(key)
+            if entry is None:
+                return self.fallback_recommendations(emotion, limit)
+            recommendations = entry['recommendations']
+            return recommendations if key == emotion else dict(recommendations, emotion=emotion)
+
+        cache_key = ('recommendations', emotion, limit)
+        cached = self.cache.get(cache_key)
+        if cached is not MISSING:
+            return cached
+
+        recommendations, used_fallback = self.fetch_recommendations(emotion, limit)
+        self.cache.set(cache_key, recommendations, self.fallback_ttl if used_fallback else None)
+        return recommendations
+
+    def fetch_recommendations(self, emotion: str, limit: int = 5, use_cache: bool = True) -> Tuple[Dict, bool]:
+        """
+        Build recommendations from the YouTube API
+        Returns: (recommendations, used_fallback); use_cache=False skips cached
+        searches and playlists (fresh answers are still stored)
+        """
         emotion_playlist = self.get_emotion_playlist(emotion)
 
         # Try to search for real YouTube playlists
-        playlists = self.search_playlists(emotion_playlist['search_query'], 3)
+        playlists = self.search_playlists(emotion_playlist['search_query'], self.candidate_playlists, use_cache)
+        if not playlists:
+            # Use fallback tracks if no playlists found
+            return self.fallback_recommendations(emotion, limit), True
 
-        tracks = []
-        if playlists:
+        if self.fetch_mode == 'single':
             # Use the first playlist found and get its videos
-            playlist_id = playlists[0]['id']
-            videos = self.get_playlist_videos(playlist_id, limit)
-
-            if videos:
-                tracks = [{
-                    'name': video['title'],
-                    'artist': video['channel_title'],
-                    'youtube_id': video['id'],
-                    'youtube_url': video['url'],
-                    'thumbnail': video['thumbnail'],
-                    'duration': video['duration']
-                } for video in videos]
-            else:
-                # Fallback to curated tracks if no videos found
-                tracks = [{
-                    'name': track['title'],
-                    'artist': 'Various Artists',
-                    'youtube_id': None,
-                    'youtube_url': track['url'],
-                    'thumbnail': '',
-                    'duration': '0:00'
-                } for track in emotion_playlist['fallback_tracks'][:limit]]
+            videos = self.get_playlist_videos(playlists[0]['id'], limit, use_cache)
         else:
-            # Use fallback tracks if no playlists found
-            tracks = [{
-                'name': track['title'],
-                'artist': 'Various Artists',
-                'youtube_id': None,
-                'youtube_url': track['url'],
-                'thumbnail': '',
-                'duration': '0:00'
-            } for track in emotion_playlist['fallback_tracks'][:limit]]
+            videos = self.get_videos_from_playlists([p['id'] for p in playlists], limit, use_cache)
+        if not videos:
+            # Fallback to curated tracks if no videos found
+            return self.fallback_recommendations(emotion, limit), True
+
+        tracks = [{
+            'name': video['title'],
+            'artist': video['channel_title'],
+            'youtube_id': video['id'],
+            'youtube_url': video['url'],
+            'thumbnail': video['thumbnail'],
+            'duration': video['duration']
+        } for video in videos]
+        return self._recommendations(emotion, emotion_playlist, tracks), False
+
+    def get_videos_from_playlists(self, playlist_ids: List[str], limit: int = 5, use_cache: bool = True) -> List[Dict]:
+        """
+        Fetch several playlists in parallel and merge their videos
+        Playlists still loading after fetch_deadline seconds are left out.
+        Videos are interleaved in search-rank order (first of each playlist,
+        then second...), with duplicates and removed videos dropped.
+        """
+        futures = [
+            self.fetch_executor.submit(self.get_playlist_videos, playlist_id, limit, use_cache)
+            for playlist_id in playlist_ids
+        ]
+        done, not_done = wait(futures, timeout=self.fetch_deadline)
+        for future in not_done:
+            # Only drops fetches still queued behind a busy pool; running
+            # ones finish in the background (their responses are cached)
+            future.cancel()
+        if not_done:
+            print(f"⚠️  {len(not_done)} of {len(futures)} YouTube playlists missed the {self.fetch_deadline:.1f}s deadline")
 
+        # Results of finished fetches, kept in search-rank order
+        results = [future.result() for future in futures if future in done]
+
+        videos = []
+        seen = set()
+        for rank in range(max((len(r) for r in results), default=0)):
+            for result in results:
+                if rank >= len(result):
+                    continue
+                video = result[rank]
+                if video['id'] in seen or video['title'] in UNAVAILABLE_TITLES:
+                    continue
+                seen.add(video['id'])
+                videos.append(video)
+        return videos[:limit]
+
+    def _recommendations(self, emotion: str, emotion_playlist: Dict, tracks: List[Dict]) -> Dict:
         return {
             'emotion': emotion,
             'playlist_name': emotion_playlist['name'],
@@ -248,5 +364,129 @@ class YouTubeIntegration:
             'total_tracks': len(tracks)
         }
 
+    def start_refresher(self, limit: int = 5) -> bool:
+        """
+        Warm recommendations for every emotion in EMOTION_PLAYLISTS on a
+        background thread, then re-fetch each entry before it goes stale.
+        Returns False when there is no API key to fetch with.
+        """
+        if not self.api_key:
+            return False
+        if self.refresher_running():
+            return True
+
+        self.refresh_limit = limit
+        self.refresh_stop.clear()
+        self.refresh_thread = threading.Thread(target=self._refresh_loop, name='youtube-refresher', daemon=True)
+        self.refresh_thread.start()
+        print(f"🔄 YouTube refresher warming {len(EMOTION_PLAYLISTS)} emotion playlists "
+              f"(refresh every {self.refresh_interval:.0f}s)")
+        return True
+
+    def stop_refresher(self, timeout: Optional[float] = None):
+        self.refresh_stop.set()
+        if self.refresh_thread is not None:
+            self.refresh_thread.join(timeout)
+        self.refresh_thread = None
+
+    def refresher_running(self) -> bool:
+        return self.refresh_thread is not None and self.refresh_thread.is_alive()
+
+    def _refresh_loop(self):
+        while not self.refresh_stop.is_set():
+            for emotion in EMOTION_PLAYLISTS:
+                if self.refresh_stop.is_set():
+                    return
+                if self._seconds_until_refresh(emotion) <= 0:
+                    self._refresh(emotion)
+
+            next_due = min(self._seconds_until_refresh(emotion) for emotion in EMOTION_PLAYLISTS)
+            self.refresh_stop.wait(max(next_due, 1.0))
+
+    def _seconds_until_refresh(self, emotion: str) -> float:
+        with self.refresh_lock:
+            entry = self.warm.get(emotion)
+        if entry is None:
+            return 0.0
+        # Entries holding curated fallbacks are retried sooner
+        interval = self.fallback_ttl if entry['fallback'] else self.refresh_interval
+        return entry['fetched_at'] + interval - time.time()
+
+    def _refresh(self, emotion: str):
+        """
+        Refresh one emotion; a failed fetch never replaces a good value
+        With the persistent store, every process's refresher shares one
+        result per emotion: a result stored less than refresh_interval ago
+        is adopted (with its age, so all processes fall due together), and
+        a lease lets only one of them call the API when it is due.
+        """
+        shared_key = f'youtube:recommendations:{emotion}:{self.refresh_limit}'
+        if self.store is not None:
+            if self._adopt_shared(emotion, shared_key):
+                return
+            if not self.store.claim(shared_key, REFRESH_LEASE_SECONDS):
+                # Another process is fetching it; its result is picked up on the next pass
+                return
+            # The previous holder may have stored a result just before we got the lease
+            if self._adopt_shared(emotion, shared_key):
+                self.store.release(shared_key)
+                return
+
+        try:
+            recommendations, used_fallback = self.fetch_recommendations(emotion, self.refresh_limit, use_cache=False)
+        except Exception as e:
+            print(f"❌ YouTube refresh failed for {emotion}: {e}")
+            recommendations, used_fallback = self.fallback_recommendations(emotion, self.refresh_limit), True
+        finally:
+            if self.store is not None:
+                self.store.release(shared_key)
+
+        if self.store is not None and not used_fallback:
+            self.store.set(shared_key, json.dumps(recommendations), self.cache.ttl)
+
+        with self.refresh_lock:
+            self.refresh_counts['refreshes'] += 1
+            if used_fallback:
+                self.refresh_counts['failures'] += 1
+        self._set_warm(emotion, recommendations, used_fallback, time.time())
+
+    def _adopt_shared(self, emotion: str, shared_key: str) -> bool:
+        """Use the shared result for emotion if it is younger than refresh_interval"""
+        entry = self.store.get_entry(shared_key)
+        if entry is MISSING or time.time() - entry[1] >= self.refresh_interval:
+            return False
+
+        self._set_warm(emotion, json.loads(entry[0]), False, entry[1])
+        with self.refresh_lock:
+            self.refresh_counts['shared'] += 1
+        return True
+
+    def _set_warm(self, emotion: str, recommendations: Dict, fallback: bool, fetched_at: float):
+        with self.refresh_lock:
+            previous = self.warm.get(emotion)
+            if fallback and previous is not None and not previous['fallback']:
+                # Keep serving the last good value, try again after fallback_ttl
+                self.warm[emotion] = dict(previous, fetched_at=time.time() - self.refresh_interval + self.fallback_ttl)
+                return
+
+            self.warm[emotion] = {
+                'recommendations': recommendations,
+                'fallback': fallback,
+                'fetched_at': fetched_at
+            }
+
+    def get_cache_stats(self) -> Dict:
+        """Hit-rate statistics of the response caches and the background refresher"""
+        stats = self.cache.get_stats()
+        stats['persistent'] = self.store.get_stats() if self.store is not None else None
+        with self.refresh_lock:
+            stats['refresher'] = {
+                'running': self.refresher_running(),
+                'interval_seconds': self.refresh_interval,
+                'warm_emotions': sorted(e for e, entry in self.warm.items() if not entry['fallback']),
+                **self.refresh_counts
+            }
+        return stats
+
 # Global YouTube instance
 youtube_client = YouTubeIntegration()
@@ -14,6 +14,7 @@ interface EmotionResult {
   music: any
   subject: any
   timestamp: string
+  next_capture_ms?: number
 }
 
 export const RealTimeEmotionDetector: React.FC = () => {
@@ -32,34 +33,44 @@ export const RealTimeEmotionDetector: React.FC = () => {
   })
 
   const [currentEmotion, setCurrentEmotion] = useState<EmotionResult | null>(null)
-  const intervalRef = useRef<NodeJS.Timeout | null>(null)
+  const timeoutRef = useRef<NodeJS.Timeout | null>(null)
+  // Delay before the next capture, as recommended by the backend
+  const captureDelayRef = useRef(1000)
 
   // Update current emotion when result changes
   useEffect(() => {
     if (emotionResult) {
       setCurrentEmotion(emotionResult)
+      if (emotionResult.next_capture_ms) {
+        captureDelayRef.current = emotionResult.next_capture_ms
+      }
     }
   }, [emotionResult])
 
   // Start/stop frame analysis based on analyzing state
   useEffect(() => {
     if (isAnalyzing && isStreaming) {
-      intervalRef.current = setInterval(() => {
-        const frameData = captureFrame()
-        if (frameData) {
-          analyzeFrame(frameData)
-        }
-      }, 1000) // Analyze every second
+      // Backs off while the emotion is stable, speeds up when it changes
+      const scheduleCapture = () => {
+        timeoutRef.current = setTimeout(() => {
+          const frameData = captureFrame()
+          if (frameData) {
+            analyzeFrame(frameData)
+          }
+          scheduleCapture()
+        }, captureDelayRef.current)
+      }
+      scheduleCapture()
     } else {
-      if (intervalRef.current) {
-        clearInterval(intervalRef.current)
-        intervalRef.current = null
+      if (timeoutRef.current) {
+        clearTimeout(timeoutRef.current)
+        timeoutRef.current = null
       }
     }
 
     return () => {
-      if (intervalRef.current) {
-        clearInterval(intervalRef.current)
+      if (timeoutRef.current) {
+        clearTimeout(timeoutRef.current)
       }
     }
   }, [isAnalyzing, isStreaming, analyzeFrame, captureFrame])
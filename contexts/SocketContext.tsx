@@ -9,6 +9,7 @@ interface EmotionResult {
   music: any
   subject: any
   timestamp: string
+  next_capture_ms?: number
 }
 
 interface SocketContextType {
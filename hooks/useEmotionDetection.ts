@@ -1,6 +1,6 @@
 'use client'
 
-import { useState, useEffect, useCallback } from 'react'
+import { useState, useEffect, useCallback, useRef } from 'react'
 
 export interface EmotionData {
   emotion: string
@@ -23,6 +23,16 @@ interface EmotionResponse {
   music: MusicRecommendation
   subject?: any
   timestamp?: string
+  next_capture_ms?: number
+}
+
+// Per-client id so the backend paces each client separately, even when
+// several share one address (e.g. behind a NAT)
+function createClientId(): string {
+  if (typeof crypto !== 'undefined' && typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID()
+  }
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`
 }
 
 export function useEmotionDetection() {
@@ -37,6 +47,11 @@ export function useEmotionDetection() {
   const [sessionStartTime, setSessionStartTime] = useState<number | null>(null)
   const [nextDetectionTime, setNextDetectionTime] = useState<number | null>(null)
   const DETECTION_SESSION_DURATION = 600000 // 10 minutes in milliseconds
+  const captureDelayRef = useRef(4000)
+  const clientIdRef = useRef<string | null>(null)
+  if (clientIdRef.current === null) {
+    clientIdRef.current = createClientId()
+  }
 
   // Backend API configuration
   const BACKEND_URL = process.env.NEXT_PUBLIC_BACKEND_URL || 'http://localhost:5000'
@@ -50,9 +65,11 @@ export function useEmotionDetection() {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          'X-Session-Id': clientIdRef.current as string,
         },
         body: JSON.stringify({
-          image: imageData
+          image: imageData,
+          session_id: clientIdRef.current
         })
       })
 
@@ -72,7 +89,8 @@ export function useEmotionDetection() {
         confidence: data.confidence,
         music: data.music,
         subject: data.subject,
-        timestamp: data.timestamp
+        timestamp: data.timestamp,
+        next_capture_ms: data.next_capture_ms
       }
     } catch (error) {
       console.error('❌ Backend API error:', error)
@@ -132,6 +150,9 @@ export function useEmotionDetection() {
 
       setCurrentEmotion(emotionData)
       setCurrentMusic(result.music)
+      if (result.next_capture_ms) {
+        captureDelayRef.current = result.next_capture_ms
+      }
 
       // Add to history (keep last 20 entries)
       setEmotionHistory(prev => {
@@ -174,19 +195,36 @@ export function useEmotionDetection() {
     setNextDetectionTime(null)
   }
 
-  // Auto-capture every 4 seconds (only when session is NOT active)
+  // Auto-capture (only when session is NOT active), every 4 seconds until
+  // the backend recommends a delay via next_capture_ms. Each capture
+  // schedules the next one, so a new delay applies from the next tick
+  // without rebuilding a timer
   const [shouldCapture, setShouldCapture] = useState(false)
+  const isAnalyzingRef = useRef(isAnalyzing)
+  const sessionActiveRef = useRef(detectionSessionActive)
+  isAnalyzingRef.current = isAnalyzing
+  sessionActiveRef.current = detectionSessionActive
 
   useEffect(() => {
-    const interval = setInterval(() => {
-      if (!isAnalyzing && !detectionSessionActive) {
-        setShouldCapture(true)
-        setTimeout(() => setShouldCapture(false), 100)
-      }
-    }, 4000)
+    let captureTimeout: ReturnType<typeof setTimeout>
+    let resetTimeout: ReturnType<typeof setTimeout>
+
+    const scheduleCapture = () => {
+      captureTimeout = setTimeout(() => {
+        if (!isAnalyzingRef.current && !sessionActiveRef.current) {
+          setShouldCapture(true)
+          resetTimeout = setTimeout(() => setShouldCapture(false), 100)
+        }
+        scheduleCapture()
+      }, captureDelayRef.current)
+    }
+    scheduleCapture()
 
-    return () => clearInterval(interval)
-  }, [isAnalyzing, detectionSessionActive])
+    return () => {
+      clearTimeout(captureTimeout)
+      clearTimeout(resetTimeout)
+    }
+  }, [])
 
   return {
     currentEmotion,
@@ -3,26 +3,28 @@
 Backend Startup Script for Emotion-Based Music Recommendation System
 """
 
+import importlib.util
 import os
 import sys
 import subprocess
 from pathlib import Path
 
 def check_dependencies():
-    """Check if required Python packages are installed"""
-    try:
-        import flask
-        import cv2
-        import numpy
-        import tensorflow
-        import flask_cors
-        print("✅ All Python dependencies are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
+    """
+    Check if required Python packages are installed
+    Uses find_spec so nothing is imported here: heavy libraries such as
+    TensorFlow load lazily, only for the detector backend that needs them
+    """
+    missing = [name for name in ('flask', 'cv2', 'numpy', 'flask_cors', 'flask_socketio')
+               if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"❌ Missing dependency: {', '.join(missing)}")
         print("Run: pip install -r requirements.txt")
         return False
 
+    print("✅ All Python dependencies are installed")
+    return True
+
 def start_backend():
     """Start the Flask backend server"""
     print("🚀 Starting Emotion-Based Music Recommendation Backend...")
@@ -33,7 +35,8 @@ def start_backend():
 
     # Start Flask server
     try:
-        from app import app
+        from app import app, start_background_tasks
+        start_background_tasks(use_reloader=True)
         print("📊 Backend Flow: Camera → Emotion Detection → Music + Subject Recommendations")
         print("🌐 Server will be available at: http://localhost:5000")
         print("📡 API Endpoints:")